@@ -3,8 +3,9 @@
 Configuration module with internationalization support
 """
 import os
+from enum import IntEnum
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Union
 
 # 项目根目录 / Project root directory
 BASE_DIR = Path(__file__).parent.resolve()
@@ -77,6 +78,25 @@ I18N_STRINGS = {
     }
 }
 
+# 文本键枚举，按中文表的键顺序编号 (TextKey.APP_TITLE == 0, ...)
+# Text key enum, numbered in the order of the zh table
+TextKey = IntEnum('TextKey', [key.upper() for key in I18N_STRINGS['zh']], start=0)
+
+# 每种语言按TextKey顺序展开的文本元组，get_text(TextKey.X) 只需一次下标访问
+# Per-language tuples in TextKey order: get_text(TextKey.X) is a single index
+_TEXT_TUPLES = {
+    lang: tuple(strings.get(k.name.lower(), k.name.lower()) for k in TextKey)
+    for lang, strings in I18N_STRINGS.items()
+}
+
+# 预先展开的 (语言, 键) -> 文本 查找表，用于字符串键
+# Flattened (lang, key) -> text table for plain string keys
+_TEXT_TABLE = {
+    (lang, key): text
+    for lang, strings in I18N_STRINGS.items()
+    for key, text in strings.items()
+}
+
 
 class Config:
     """全局配置类 / Global configuration class"""
@@ -86,9 +106,16 @@ class Config:
     LANGUAGE = os.getenv('HINDI_TRAINER_LANG', 'zh')
     
     @classmethod
-    def get_text(cls, key: str, *args) -> str:
+    def get_text(cls, key: Union[TextKey, str], *args) -> str:
         """获取国际化文本 / Get internationalized text"""
-        text = I18N_STRINGS.get(cls.LANGUAGE, I18N_STRINGS['zh']).get(key, key)
+        if isinstance(key, TextKey):
+            text = _TEXT_TUPLES.get(cls.LANGUAGE, _TEXT_TUPLES['zh'])[key]
+        else:
+            text = _TEXT_TABLE.get((cls.LANGUAGE, key))
+        if text is None:
+            # 未知语言或键：回退到原有的查找逻辑
+            # Unknown language or key: fall back to the original lookup
+            text = I18N_STRINGS.get(cls.LANGUAGE, I18N_STRINGS['zh']).get(key, key)
         if args:
             return text.format(*args)
         return text
@@ -102,10 +129,15 @@ class Config:
     # Whisper模型配置 / Whisper model configuration
     WHISPER_MODEL_SIZE = os.getenv('WHISPER_MODEL_SIZE', 'medium')
     WHISPER_MODEL_DIR = Path(os.getenv('HF_HOME', BASE_DIR / 'models'))
+    # 计算精度，留空按设备自动选择（GPU: int8_float16, CPU: int8）
+    # Compute type for faster-whisper; empty picks one per device
+    WHISPER_COMPUTE_TYPE = os.getenv('WHISPER_COMPUTE_TYPE', '')
     
     # TTS配置 / TTS configuration
     TTS_VOICE = "hi-IN-MadhurNeural"
     TTS_TEMP_DIR = BASE_DIR / 'temp'
+    TTS_CACHE_DIR = TTS_TEMP_DIR / 'tts_cache'  # 合成结果缓存目录
+    TTS_CACHE_MAX_FILES = 500                  # 缓存保留的最大文件数
     
     # 音频配置 / Audio configuration
     # 参考项目使用的标准参数 / Standard parameters from reference project
@@ -127,7 +159,7 @@ class Config:
     SRS_EASINESS_FACTOR = 1.3             # 高级阶段的增长因子
 
 
-# 创建必要的目录 / Create necessary directories
-Config.TTS_TEMP_DIR.mkdir(parents=True, exist_ok=True)
-Config.WHISPER_MODEL_DIR.mkdir(parents=True, exist_ok=True)
-Path(Config.DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+# 固定Hugging Face缓存位置，确保子进程和依赖库使用同一模型目录
+# Pin the Hugging Face cache so every library resolves the same model directory
+os.environ.setdefault('HF_HOME', str(Config.WHISPER_MODEL_DIR))
+os.environ.setdefault('HF_HUB_CACHE', str(Config.WHISPER_MODEL_DIR))
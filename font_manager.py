@@ -6,10 +6,26 @@ Font Manager Module
 """
 import os
 import sys
+import atexit
 import ctypes
 from pathlib import Path
 from tkinter import font
 
+# FR_PRIVATE = 0x10 (只给当前应用使用)
+FR_PRIVATE = 0x10
+
+# Windows GDI字体API只在模块加载时解析一次
+if sys.platform == 'win32':
+    _gdi32 = ctypes.WinDLL('gdi32')
+    
+    _AddFontResourceEx = _gdi32.AddFontResourceExW
+    _AddFontResourceEx.argtypes = [ctypes.c_wchar_p, ctypes.c_uint, ctypes.c_void_p]
+    _AddFontResourceEx.restype = ctypes.c_int
+    
+    _RemoveFontResourceEx = _gdi32.RemoveFontResourceExW
+    _RemoveFontResourceEx.argtypes = [ctypes.c_wchar_p, ctypes.c_uint, ctypes.c_void_p]
+    _RemoveFontResourceEx.restype = ctypes.c_int
+
 
 class FontManager:
     """字体管理器"""
@@ -19,6 +35,10 @@ class FontManager:
         self.font_dir = self.base_dir / "font"
         self.hindi_font = None
         self.hindi_font_bold = None
+        # 字体缓存: (family, size, bold) -> font.Font
+        self._font_cache = {}
+        # 已通过GDI加载的字体文件
+        self._loaded_font_files = []
         
     def load_fonts(self):
         """加载印地语字体"""
@@ -28,50 +48,65 @@ class FontManager:
                 self._load_windows_font()
             
             # 创建字体对象
-            self.hindi_font = font.Font(family="Noto Sans Devanagari", size=20)
-            self.hindi_font_bold = font.Font(family="Noto Sans Devanagari", size=24, weight="bold")
+            self.hindi_font = self._get_font("Noto Sans Devanagari", 20)
+            self.hindi_font_bold = self._get_font("Noto Sans Devanagari", 24, bold=True)
             
             return True
             
         except Exception as e:
             print(f"Warning: Failed to load custom font: {e}")
             # 使用备用字体
-            self.hindi_font = font.Font(family="Arial", size=20)
-            self.hindi_font_bold = font.Font(family="Arial", size=24, weight="bold")
+            self.hindi_font = self._get_font("Arial", 20)
+            self.hindi_font_bold = self._get_font("Arial", 24, bold=True)
             return False
     
     def _load_windows_font(self):
         """Windows系统加载字体"""
         try:
-            # 加载字体文件
-            regular_ttf = self.font_dir / "static" / "NotoSansDevanagari-Regular.ttf"
-            bold_ttf = self.font_dir / "static" / "NotoSansDevanagari-Bold.ttf"
+            static_dir = self.font_dir / "static"
+            font_files = [
+                static_dir / "NotoSansDevanagari-Regular.ttf",
+                static_dir / "NotoSansDevanagari-Bold.ttf",
+            ]
             
-            if regular_ttf.exists():
+            for ttf in font_files:
+                path = str(ttf)
+                if path in self._loaded_font_files or not ttf.exists():
+                    continue
                 # 使用Windows API加载字体
-                gdi32 = ctypes.WinDLL('gdi32')
-                AddFontResourceEx = gdi32.AddFontResourceExW
-                AddFontResourceEx.argtypes = [ctypes.c_wchar_p, ctypes.c_uint, ctypes.c_void_p]
-                AddFontResourceEx.restype = ctypes.c_int
-                
-                # FR_PRIVATE = 0x10 (只给当前应用使用)
-                AddFontResourceEx(str(regular_ttf), 0x10, None)
-                
-            if bold_ttf.exists():
-                gdi32 = ctypes.WinDLL('gdi32')
-                AddFontResourceEx = gdi32.AddFontResourceExW
-                AddFontResourceEx.argtypes = [ctypes.c_wchar_p, ctypes.c_uint, ctypes.c_void_p]
-                AddFontResourceEx.restype = ctypes.c_int
-                AddFontResourceEx(str(bold_ttf), 0x10, None)
+                if _AddFontResourceEx(path, FR_PRIVATE, None):
+                    if not self._loaded_font_files:
+                        atexit.register(self._unload_windows_fonts)
+                    self._loaded_font_files.append(path)
                 
         except Exception as e:
             print(f"Warning: Windows font loading failed: {e}")
     
+    def _unload_windows_fonts(self):
+        """退出时释放私有字体资源"""
+        for path in self._loaded_font_files:
+            _RemoveFontResourceEx(path, FR_PRIVATE, None)
+        self._loaded_font_files.clear()
+    
+    def _get_font(self, family, size, bold=False):
+        """获取缓存的字体对象，相同参数只创建一次Tk字体"""
+        key = (family, size, bold)
+        f = self._font_cache.get(key)
+        if f is None:
+            if bold:
+                f = font.Font(family=family, size=size, weight="bold")
+            else:
+                f = font.Font(family=family, size=size)
+            self._font_cache[key] = f
+        return f
+    
+    def get_font(self, family, size, bold=False):
+        """获取（缓存的）指定字体"""
+        return self._get_font(family, size, bold)
+    
     def get_hindi_font(self, size=20, bold=False):
         """获取印地语字体"""
-        if bold:
-            return font.Font(family="Noto Sans Devanagari", size=size, weight="bold")
-        return font.Font(family="Noto Sans Devanagari", size=size)
+        return self._get_font("Noto Sans Devanagari", size, bold)
 
 
 # 全局字体管理器实例
@@ -6,6 +6,9 @@ import sys
 import os
 import tempfile
 import asyncio
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime, date
 
@@ -16,12 +19,18 @@ from config import Config
 from modules.database import VocabDatabase
 from modules.srs import SM2Algorithm
 from modules.scoring import PronunciationScorer
-from modules.whisper_engine import WhisperEngine
+from modules.whisper_engine import WhisperManager
 from modules.tts import HindiTTS
 from modules.audio import AudioManager
 
 
 class HindiTrainerApp:
+    # 复习时每次从数据库取出的单词数
+    REVIEW_BATCH_SIZE = 50
+    
+    # 初始化失败时可以降级运行的组件 -> 界面显示名称
+    OPTIONAL_COMPONENTS = {'tts': "语音合成", 'audio_mgr': "音频设备"}
+    
     def __init__(self, page: ft.Page):
         self.page = page
         self.page.title = "印地语影子跟读训练器"
@@ -30,21 +39,57 @@ class HindiTrainerApp:
         self.page.window_width = 1200
         self.page.window_height = 800
         
-        # 初始化组件
-        self.db = VocabDatabase()
-        self.tts = HindiTTS()
-        self.scorer = PronunciationScorer()
-        self.srs = SM2Algorithm()
-        self.audio_mgr = AudioManager()
+        # 初始化组件（并发执行，数据库和TTS缓存的I/O互相重叠）
+        self._init_components()
         self.whisper_engine = None
+        self.record_btn = None
+        
+        # 最近一次输入文本及其NFC标准化结果（重复练习同一句时复用）
+        self._last_normalized = (None, None)
+        
+        # 首页控件树只构建一次，之后只更新统计数值
+        self._home_view = None
         
         # 当前视图
         self.current_view = "home"
         
         self.setup_ui()
     
+    def _init_components(self):
+        """并发初始化各组件；数据库/评分/复习算法失败时无法继续，
+        语音合成和音频设备失败时置为None，并记录在self.unavailable中"""
+        components = {
+            'db': VocabDatabase,
+            'tts': HindiTTS,
+            'scorer': PronunciationScorer,
+            'srs': SM2Algorithm,
+            'audio_mgr': AudioManager,
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(components)) as executor:
+            futures = {name: executor.submit(factory) for name, factory in components.items()}
+        
+        self.unavailable = []
+        for name, future in futures.items():
+            try:
+                setattr(self, name, future.result())
+            except Exception:
+                if name not in self.OPTIONAL_COMPONENTS:
+                    raise
+                self.unavailable.append(self.OPTIONAL_COMPONENTS[name])
+                setattr(self, name, None)
+    
     def setup_ui(self):
         """设置UI"""
+        # Whisper模型状态
+        self.whisper_status = ft.Text("⏳ 模型加载中...", size=14)
+        
+        # 初始化失败的可选组件
+        self.component_status = ft.Text(
+            f"⚠️ {'、'.join(self.unavailable)}不可用", size=14,
+            visible=bool(self.unavailable)
+        )
+        
         # 顶部导航栏
         self.app_bar = ft.AppBar(
             title=ft.Text("🇮🇳 印地语影子跟读训练器", size=20, weight=ft.FontWeight.BOLD),
@@ -52,14 +97,28 @@ class HindiTrainerApp:
             bgcolor=ft.colors.DEEP_PURPLE,
             color=ft.colors.WHITE,
             actions=[
-                ft.IconButton(ft.icons.HOME, tooltip="首页", on_click=lambda _: self.show_home()),
-                ft.IconButton(ft.icons.MIC, tooltip="跟读", on_click=lambda _: self.show_shadowing()),
-                ft.IconButton(ft.icons.BOOK, tooltip="复习", on_click=lambda _: self.show_review()),
-                ft.IconButton(ft.icons.ADD_CIRCLE, tooltip="添加", on_click=lambda _: self.show_add_vocab()),
-                ft.IconButton(ft.icons.ANALYTICS, tooltip="统计", on_click=lambda _: self.show_stats()),
+                ft.Container(self.component_status, padding=ft.padding.only(right=10)),
+                ft.Container(self.whisper_status, padding=ft.padding.only(right=10)),
+                *self._nav_buttons(),
             ]
         )
         
+        # 对话框只创建一次，显示时只修改文本
+        self._loading_text = ft.Text()
+        self._loading_dialog = ft.AlertDialog(
+            content=ft.Column(
+                [ft.ProgressRing(), self._loading_text],
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER
+            )
+        )
+        
+        self._done_text = ft.Text()
+        self._done_dialog = ft.AlertDialog(
+            title=ft.Text("🎉 复习完成!"),
+            content=self._done_text,
+            actions=[ft.TextButton("确定", on_click=self._close_done_dialog)]
+        )
+        
         # 主要内容区域
         self.main_content = ft.Container(
             content=self.build_home_view(),
@@ -69,61 +128,126 @@ class HindiTrainerApp:
         
         self.page.appbar = self.app_bar
         self.page.add(self.main_content)
+        
+        # 后台预加载Whisper模型，避免首次识别时卡顿
+        WhisperManager.preload(on_done=self.on_whisper_loaded)
     
-    def build_home_view(self):
-        """构建首页视图"""
-        stats = self.db.get_statistics()
+    def _close_done_dialog(self, _event):
+        """关闭复习完成对话框并返回首页"""
+        self._done_dialog.open = False
+        self.show_home()
+    
+    def _nav_buttons(self):
+        """导航按钮"""
+        nav_items = (
+            (ft.icons.HOME, "首页", self.show_home),
+            (ft.icons.MIC, "跟读", self.show_shadowing),
+            (ft.icons.BOOK, "复习", self.show_review),
+            (ft.icons.ADD_CIRCLE, "添加", self.show_add_vocab),
+            (ft.icons.ANALYTICS, "统计", self.show_stats),
+        )
+        return [
+            ft.IconButton(icon, tooltip=tooltip, on_click=partial(self._navigate, show))
+            for icon, tooltip, show in nav_items
+        ]
+    
+    def _navigate(self, show, _event):
+        """点击事件 -> 视图切换"""
+        show()
+    
+    def on_whisper_loaded(self, error):
+        """Whisper模型加载完成回调（后台线程）"""
+        if error is None:
+            self.whisper_engine = WhisperManager.get_engine()
+            self.whisper_status.value = "✅ 模型就绪"
+        else:
+            self.whisper_status.value = "❌ 模型加载失败"
         
-        return ft.Column(
-            [
-                ft.Container(
-                    content=ft.Column(
+        if self.record_btn is not None:
+            self.record_btn.disabled = error is not None or self.audio_mgr is None
+        self.page.update()
+    
+    def _normalized_input(self, text):
+        """返回NFC标准化的输入文本，同一文本只标准化一次"""
+        if self._last_normalized[0] != text:
+            self._last_normalized = (text, unicodedata.normalize('NFC', text))
+        return self._last_normalized[1]
+    
+    def _get_stats(self):
+        """获取统计数据（数据库层缓存，写操作后失效，跨日自动刷新）"""
+        return self.db.get_statistics_cached()
+    
+    def build_home_view(self):
+        """构建首页视图（控件树缓存，只刷新统计数值）"""
+        if self._home_view is None:
+            self._home_total_text = self._stat_value_text()
+            self._home_due_text = self._stat_value_text()
+            self._home_mastered_text = self._stat_value_text()
+            
+            self._home_view = ft.Column(
+                [
+                    ft.Container(
+                        content=ft.Column(
+                            [
+                                ft.Text("欢迎回来!", size=32, weight=ft.FontWeight.BOLD),
+                                ft.Text("继续你的印地语学习之旅", size=16, color=ft.colors.GREY_600),
+                            ],
+                            horizontal_alignment=ft.CrossAxisAlignment.CENTER
+                        ),
+                        padding=40,
+                        alignment=ft.alignment.center
+                    ),
+                    
+                    # 统计卡片行
+                    ft.Row(
                         [
-                            ft.Text("欢迎回来!", size=32, weight=ft.FontWeight.BOLD),
-                            ft.Text("继续你的印地语学习之旅", size=16, color=ft.colors.GREY_600),
+                            self._stat_card("📚", self._home_total_text, "总词汇"),
+                            self._stat_card("📅", self._home_due_text, "待复习"),
+                            self._stat_card("🏆", self._home_mastered_text, "已掌握"),
                         ],
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER
+                        alignment=ft.MainAxisAlignment.SPACE_EVENLY
                     ),
-                    padding=40,
-                    alignment=ft.alignment.center
-                ),
-                
-                # 统计卡片行
-                ft.Row(
-                    [
-                        self._stat_card("📚", str(stats['total_words']), "总词汇"),
-                        self._stat_card("📅", str(stats['due_today']), "待复习", 
-                                       color=ft.colors.RED if stats['due_today'] > 0 else ft.colors.GREEN),
-                        self._stat_card("🏆", str(stats['stage_distribution'].get(5, 0)), "已掌握"),
-                    ],
-                    alignment=ft.MainAxisAlignment.SPACE_EVENLY
-                ),
-                
-                ft.Divider(height=40),
-                
-                # 快速操作
-                ft.Text("快速开始", size=24, weight=ft.FontWeight.BOLD),
-                ft.Row(
-                    [
-                        self._action_button("🎙️ 开始跟读", ft.colors.BLUE, self.show_shadowing),
-                        self._action_button("📚 每日复习", ft.colors.ORANGE, self.show_review),
-                        self._action_button("➕ 添加单词", ft.colors.GREEN, self.show_add_vocab),
-                    ],
-                    alignment=ft.MainAxisAlignment.SPACE_EVENLY
-                ),
-            ],
-            scroll=ft.ScrollMode.AUTO,
-            expand=True
-        )
+                    
+                    ft.Divider(height=40),
+                    
+                    # 快速操作
+                    ft.Text("快速开始", size=24, weight=ft.FontWeight.BOLD),
+                    ft.Row(
+                        [
+                            self._action_button("🎙️ 开始跟读", ft.colors.BLUE, self.show_shadowing),
+                            self._action_button("📚 每日复习", ft.colors.ORANGE, self.show_review),
+                            self._action_button("➕ 添加单词", ft.colors.GREEN, self.show_add_vocab),
+                        ],
+                        alignment=ft.MainAxisAlignment.SPACE_EVENLY
+                    ),
+                ],
+                scroll=ft.ScrollMode.AUTO,
+                expand=True
+            )
+        
+        self._refresh_home_stats()
+        return self._home_view
+    
+    def _refresh_home_stats(self):
+        """把最新统计写入首页卡片"""
+        stats = self._get_stats()
+        self._home_total_text.value = str(stats['total_words'])
+        self._home_due_text.value = str(stats['due_today'])
+        self._home_due_text.color = ft.colors.RED if stats['due_today'] > 0 else ft.colors.GREEN
+        self._home_mastered_text.value = str(stats['stage_distribution'].get(5, 0))
+    
+    def _stat_value_text(self):
+        """统计卡片的数值文本"""
+        return ft.Text(size=36, weight=ft.FontWeight.BOLD, color=ft.colors.DEEP_PURPLE)
     
-    def _stat_card(self, icon, value, label, color=ft.colors.DEEP_PURPLE):
+    def _stat_card(self, icon, value_text, label):
         """统计卡片"""
         return ft.Card(
             content=ft.Container(
                 content=ft.Column(
                     [
                         ft.Text(icon, size=40),
-                        ft.Text(value, size=36, weight=ft.FontWeight.BOLD, color=color),
+                        value_text,
                         ft.Text(label, size=14, color=ft.colors.GREY_600),
                     ],
                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -146,7 +270,7 @@ class HindiTrainerApp:
                 padding=ft.padding.symmetric(horizontal=40, vertical=20),
                 text_style=ft.TextStyle(size=16, weight=ft.FontWeight.BOLD)
             ),
-            on_click=lambda _: on_click()
+            on_click=partial(self._navigate, on_click)
         )
     
     def show_shadowing(self):
@@ -170,51 +294,80 @@ class HindiTrainerApp:
                 return
             
             # 显示加载
-            self.page.dialog = ft.AlertDialog(
-                content=ft.Column(
-                    [ft.ProgressRing(), ft.Text("识别中...")],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER
-                )
-            )
-            self.page.dialog.open = True
+            self._loading_text.value = "识别中..."
+            self.page.dialog = self._loading_dialog
+            self._loading_dialog.open = True
             self.page.update()
             
+            recording_path = None
             try:
                 # 录音（简化版，实际应该使用音频录制）
-                recording_path = tempfile.mktemp(suffix='.wav')
-                self.audio_mgr.record(5, recording_path)  # 录制5秒示例
+                Config.TTS_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False,
+                                                 dir=Config.TTS_TEMP_DIR) as tmp:
+                    recording_path = tmp.name
+                
+                # 阻塞操作放到线程中执行，保持事件循环响应（进度环可以转动）
+                if not await asyncio.to_thread(self.audio_mgr.record, 5, recording_path):  # 录制5秒示例
+                    raise RuntimeError("录音失败")
                 
-                # 加载Whisper（如果未加载）
-                if self.whisper_engine is None:
-                    self.whisper_engine = WhisperEngine()
+                # 获取预加载的Whisper（如果后台尚未完成则等待）
+                self.whisper_engine = await asyncio.to_thread(WhisperManager.get_engine)
                 
                 # 识别
-                transcribed = self.whisper_engine.transcribe(recording_path)
+                transcribed = await asyncio.to_thread(self.whisper_engine.transcribe, recording_path)
                 
-                # 评分
-                score = self.scorer.calculate_score(input_text.value, transcribed)
+                # 评分（两侧统一为NFC，避免天城文组合字符差异影响得分）
+                score = self.scorer.calculate_score(
+                    self._normalized_input(input_text.value),
+                    unicodedata.normalize('NFC', transcribed)
+                )
                 
                 # 更新结果
                 result_text.value = f"识别结果: {transcribed}"
                 score_text.value = f"{score}%"
                 score_text.color = ft.colors.GREEN if score >= 70 else ft.colors.ORANGE if score >= 50 else ft.colors.RED
                 
-                self.page.dialog.open = False
+                self._loading_dialog.open = False
                 
             except Exception as ex:
                 result_text.value = f"错误: {str(ex)}"
-                self.page.dialog.open = False
+                self._loading_dialog.open = False
+            finally:
+                if recording_path:
+                    Path(recording_path).unlink(missing_ok=True)
             
             self.page.update()
         
         async def on_play(e):
             if input_text.value:
                 try:
-                    audio_path = await self.tts.synthesize(input_text.value)
-                    self.audio_mgr.play(str(audio_path))
+                    # 边合成边播放，首个数据块到达即出声；ffplay失败时退回到合成后播放
+                    # (TTS/网络错误直接抛出，由下面显示提示)
+                    streamed = (self.audio_mgr.can_stream() and
+                                await self.audio_mgr.play_stream(self.tts.stream(input_text.value)))
+                    if not streamed:
+                        audio_path = await self.tts.synthesize(input_text.value)
+                        if not await asyncio.to_thread(self.audio_mgr.play, str(audio_path)):
+                            raise RuntimeError("音频播放失败")
                 except Exception as ex:
                     self.page.show_snack_bar(ft.SnackBar(content=ft.Text(f"播放失败: {str(ex)}")))
         
+        # 模型就绪前禁用录音按钮；语音合成/音频设备不可用时禁用对应按钮
+        self.record_btn = ft.ElevatedButton(
+            "🎤 录制并识别", bgcolor=ft.colors.RED, color=ft.colors.WHITE,
+            on_click=on_transcribe,
+            disabled=not WhisperManager.is_loaded() or self.audio_mgr is None
+        )
+        play_btn = ft.ElevatedButton(
+            "🔊 播放标准发音", on_click=on_play,
+            disabled=self.tts is None or self.audio_mgr is None
+        )
+        unavailable_text = ft.Text(
+            f"⚠️ {'、'.join(self.unavailable)}不可用，相关功能已禁用",
+            color=ft.colors.ORANGE, visible=bool(self.unavailable)
+        )
+        
         view = ft.Column(
             [
                 ft.Text("🎙️ 跟读训练", size=28, weight=ft.FontWeight.BOLD),
@@ -222,11 +375,12 @@ class HindiTrainerApp:
                 input_text,
                 ft.Row(
                     [
-                        ft.ElevatedButton("🔊 播放标准发音", on_click=on_play),
-                        ft.ElevatedButton("🎤 录制并识别", bgcolor=ft.colors.RED, color=ft.colors.WHITE, on_click=on_transcribe),
+                        play_btn,
+                        self.record_btn,
                     ],
                     spacing=20
                 ),
+                unavailable_text,
                 ft.Divider(),
                 ft.Text("识别结果", size=20, weight=ft.FontWeight.BOLD),
                 result_text,
@@ -244,7 +398,8 @@ class HindiTrainerApp:
         """显示复习页面"""
         self.current_view = "review"
         
-        due_words = self.db.get_due_words()
+        # 按列分批获取，卡片刷新时只做元组下标访问
+        due_words = self.db.get_due_batch(limit=self.REVIEW_BATCH_SIZE)
         
         if not due_words:
             view = ft.Column(
@@ -261,113 +416,125 @@ class HindiTrainerApp:
             self.page.update()
             return
         
+        batch = [due_words]
         current_index = [0]
+        reviewed = [0]
         show_answer = [False]
+        total_due = max(self._get_stats()['due_today'], len(due_words))
         
-        def build_card():
-            word = due_words[current_index[0]]
-            
-            # 构建卡片内容
-            card_content = [
-                ft.Text(f"{current_index[0] + 1} / {len(due_words)}", 
-                       size=14, color=ft.colors.GREY_600),
-                ft.Text(word['word'], size=48, weight=ft.FontWeight.BOLD),
-                ft.Text(f"阶段 {word['review_stage']}", 
-                       size=14, color=ft.colors.GREY_600),
+        # 预先创建卡片控件，切换单词/显示答案时只修改属性，不重建控件树
+        progress_text = ft.Text(size=14, color=ft.colors.GREY_600)
+        word_text = ft.Text(size=48, weight=ft.FontWeight.BOLD)
+        stage_text = ft.Text(size=14, color=ft.colors.GREY_600)
+        meaning_text = ft.Text(size=32, color=ft.colors.GREEN)
+        context_text = ft.Text(size=16, color=ft.colors.GREY_600, italic=True)
+        
+        # 答案和评分按钮
+        answer_col = ft.Column(
+            [
+                meaning_text,
+                context_text,
                 ft.Divider(),
+                ft.Text("记忆程度?", size=18),
+                ft.Row(
+                    [
+                        ft.ElevatedButton("😵 忘了", 
+                                        on_click=lambda _: rate_word(0)),
+                        ft.ElevatedButton("😰 模糊", 
+                                        on_click=lambda _: rate_word(3)),
+                        ft.ElevatedButton("🙂 记得", 
+                                        on_click=lambda _: rate_word(4)),
+                        ft.ElevatedButton("😎 秒杀", 
+                                        on_click=lambda _: rate_word(5)),
+                    ],
+                    alignment=ft.MainAxisAlignment.SPACE_EVENLY
+                )
             ]
-            
-            if show_answer[0]:
-                # 显示答案和评分按钮
-                answer_content = [
-                    ft.Text(word['meaning'], size=32, color=ft.colors.GREEN),
-                ]
-                
-                if word.get('context_sentence'):
-                    answer_content.append(
-                        ft.Text(f"例句: {word['context_sentence']}", 
-                               size=16, color=ft.colors.GREY_600, italic=True)
-                    )
-                
-                answer_content.extend([
-                    ft.Divider(),
-                    ft.Text("记忆程度?", size=18),
-                    ft.Row(
-                        [
-                            ft.ElevatedButton("😵 忘了", 
-                                            on_click=lambda _: rate_word(0)),
-                            ft.ElevatedButton("😰 模糊", 
-                                            on_click=lambda _: rate_word(3)),
-                            ft.ElevatedButton("🙂 记得", 
-                                            on_click=lambda _: rate_word(4)),
-                            ft.ElevatedButton("😎 秒杀", 
-                                            on_click=lambda _: rate_word(5)),
-                        ],
-                        alignment=ft.MainAxisAlignment.SPACE_EVENLY
-                    )
-                ])
-                
-                card_content.append(ft.Column(answer_content))
-            else:
-                # 显示答案按钮
-                card_content.append(
-                    ft.ElevatedButton("👀 显示答案", 
+        )
+        
+        # 显示答案按钮
+        show_btn = ft.ElevatedButton("👀 显示答案", 
                                     on_click=lambda _: show_answer_btn())
-                )
-            
-            return ft.Card(
-                content=ft.Container(
-                    content=ft.Column(
-                        card_content,
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                        spacing=20
-                    ),
-                    padding=40,
-                    width=600
+        
+        card = ft.Card(
+            content=ft.Container(
+                content=ft.Column(
+                    [
+                        progress_text,
+                        word_text,
+                        stage_text,
+                        ft.Divider(),
+                        answer_col,
+                        show_btn,
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    spacing=20
                 ),
-                elevation=10
-            )
+                padding=40,
+                width=600
+            ),
+            elevation=10
+        )
+        
+        def build_card():
+            """将当前单词写入卡片控件"""
+            words, i = batch[0], current_index[0]
+            
+            progress_text.value = f"{reviewed[0] + 1} / {total_due}"
+            word_text.value = words.words[i]
+            stage_text.value = f"阶段 {words.stages[i]}"
+            meaning_text.value = words.meanings[i]
+            
+            context = words.contexts[i]
+            context_text.value = f"例句: {context}" if context else ""
+            context_text.visible = bool(context)
+            
+            answer_col.visible = show_answer[0]
+            show_btn.visible = not show_answer[0]
         
         def show_answer_btn():
             show_answer[0] = True
             refresh_view()
         
         def rate_word(quality):
-            word = due_words[current_index[0]]
+            words, i = batch[0], current_index[0]
             result = self.srs.calculate_next_review(
-                word['review_stage'],
+                words.stages[i],
                 quality
             )
-            self.db.update_review(word['id'], quality, 
+            self.db.update_review(words.ids[i], quality, 
                                 result['next_date'], result['new_stage'])
             
             current_index[0] += 1
+            reviewed[0] += 1
             show_answer[0] = False
             
-            if current_index[0] >= len(due_words):
-                self.page.dialog = ft.AlertDialog(
-                    title=ft.Text("🎉 复习完成!"),
-                    content=ft.Text(f"完成了 {len(due_words)} 个单词的复习"),
-                    actions=[ft.TextButton("确定", on_click=lambda _: close_dialog())]
-                )
-                self.page.dialog.open = True
+            # 当前批次用完后再取下一批（已复习的单词下次复习日期至少是明天，不会重复取到）
+            if current_index[0] >= len(batch[0]):
+                batch[0] = self.db.get_due_batch(limit=self.REVIEW_BATCH_SIZE)
+                current_index[0] = 0
             
-            refresh_view()
-        
-        def close_dialog():
-            self.page.dialog.open = False
-            self.show_home()
+            # 先修改状态，最后只调用一次page.update()
+            if not batch[0]:
+                self._done_text.value = f"完成了 {reviewed[0]} 个单词的复习"
+                self.page.dialog = self._done_dialog
+                self._done_dialog.open = True
+            else:
+                build_card()
+            
+            self.page.update()
         
         def refresh_view():
-            if current_index[0] < len(due_words):
-                view_content.controls[1] = build_card()
+            if current_index[0] < len(batch[0]):
+                build_card()
                 self.page.update()
         
+        build_card()
         view_content = ft.Column(
             [
                 ft.Text("📚 每日复习", size=28, weight=ft.FontWeight.BOLD),
                 ft.Divider(),
-                build_card(),
+                card,
             ],
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             alignment=ft.MainAxisAlignment.CENTER,
@@ -397,9 +564,9 @@ class HindiTrainerApp:
                     meaning_input.value,
                     context_input.value if context_input.value else None
                 )
-                self.page.show_snack_bar(
-                    ft.SnackBar(content=ft.Text(f"✅ 已保存! ID: {word_id}"))
-                )
+                # 提示和清空输入合并为一次page.update()
+                self.page.snack_bar = ft.SnackBar(content=ft.Text(f"✅ 已保存! ID: {word_id}"))
+                self.page.snack_bar.open = True
                 word_input.value = ""
                 meaning_input.value = ""
                 context_input.value = ""
@@ -431,31 +598,28 @@ class HindiTrainerApp:
         """显示统计页面"""
         self.current_view = "stats"
         
-        stats = self.db.get_statistics()
+        stats = self._get_stats()
         
-        # 创建图表数据
+        # 创建图表数据（循环不变量提前计算）
         stage_data = stats['stage_distribution']
-        chart_bars = []
+        total = max(stats['total_words'], 1)
+        counts = [stage_data.get(stage, 0) for stage in range(6)]
         
-        for stage in range(6):
-            count = stage_data.get(stage, 0)
-            max_count = max(stage_data.values()) if stage_data else 1
-            percentage = (count / max_count * 100) if max_count > 0 else 0
-            
-            chart_bars.append(
-                ft.Row(
-                    [
-                        ft.Text(f"阶段 {stage}", width=80),
-                        ft.ProgressBar(
-                            value=count / max(stats['total_words'], 1),
-                            width=400,
-                            color=ft.colors.DEEP_PURPLE
-                        ),
-                        ft.Text(str(count), width=50),
-                    ],
-                    alignment=ft.MainAxisAlignment.START
-                )
+        chart_bars = [
+            ft.Row(
+                [
+                    ft.Text(f"阶段 {stage}", width=80),
+                    ft.ProgressBar(
+                        value=count / total,
+                        width=400,
+                        color=ft.colors.DEEP_PURPLE
+                    ),
+                    ft.Text(str(count), width=50),
+                ],
+                alignment=ft.MainAxisAlignment.START
             )
+            for stage, count in enumerate(counts)
+        ]
         
         view = ft.Column(
             [
@@ -6,17 +6,38 @@ YouTube Learning Interface Module
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Import from main_gui for colors
 from main_gui import COLORS, CardFrame, ModernButton
 from font_manager import font_manager
+from modules.database import VocabDatabase
+from modules.translator import HindiTranslator
+from modules.segmentation import split_segments
+
+# YouTube下载与Whisper转录依赖可选组件
+# YouTube download and Whisper transcription need optional packages
+try:
+    from modules.youtube_handler import YouTubeHandler, check_ffmpeg, setup_ffmpeg_path
+    from modules.whisper_engine import WhisperManager
+    YOUTUBE_AVAILABLE = True
+except ImportError as e:
+    YOUTUBE_AVAILABLE = False
+    print(f"Warning: YouTube features disabled: {e}")
 
 
 class YouTubeFrame(tk.Frame):
     """YouTube学习框架"""
     
+    # 勾选列显示的符号 / Check-column glyphs (unchecked, checked)
+    CHECK_MARKS = ('☐', '☑')
+    
+    # 后台线程UI更新队列的轮询间隔（毫秒） / UI queue poll interval in ms
+    UI_PUMP_MS = 50
+    
     def __init__(self, parent, main_app):
         super().__init__(parent, bg=COLORS['bg_dark'])
         self.main_app = main_app
@@ -25,14 +46,41 @@ class YouTubeFrame(tk.Frame):
         self.youtube_handler = None
         self.translator = None
         self.whisper_engine = None
+        self.db = None
+        
+        # 后台线程把UI更新放入队列，由主线程定时批量执行
+        # Worker threads enqueue UI updates; the Tk thread drains them in batches
+        self._ui_q = queue.Queue()
+        
+        # 印地语字体只创建一次 / Build the Hindi font once
+        self._hindi_font = font_manager.get_hindi_font(size=16)
         
         # 当前处理状态
         self.video_info = None
         self.segments = []
-        self.selected_segments = []
+        self.selected_indices = set()
         
         self.create_ui()
         
+        # 后台预热Whisper模型，首次分析时无需等待加载
+        # Warm the Whisper model in the background for the first analysis
+        if YOUTUBE_AVAILABLE and not WhisperManager.is_loaded():
+            WhisperManager.preload()
+        
+        self.after(self.UI_PUMP_MS, self._pump_ui_queue)
+        
+    def _pump_ui_queue(self):
+        """在主线程中执行队列里的全部UI更新"""
+        if not self.winfo_exists():
+            return
+        while True:
+            try:
+                fn = self._ui_q.get_nowait()
+            except queue.Empty:
+                break
+            fn()
+        self.after(self.UI_PUMP_MS, self._pump_ui_queue)
+        
     def create_ui(self):
         """创建UI"""
         # 标题
@@ -194,26 +242,43 @@ class YouTubeFrame(tk.Frame):
         list_frame = tk.Frame(results_card, bg=COLORS['bg_card'])
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0, 20))
         
-        # Canvas + Scrollbar
-        self.canvas = tk.Canvas(list_frame, bg=COLORS['bg_card'], 
-                               highlightthickness=0)
-        scrollbar = tk.Scrollbar(list_frame, orient="vertical", 
-                                command=self.canvas.yview)
-        
-        self.results_frame = tk.Frame(self.canvas, bg=COLORS['bg_card'])
+        # 结果表格（Treeview只渲染可见行，不为每个片段创建控件）
+        # Results table: Treeview renders visible rows only
+        style = ttk.Style()
+        style.configure('Results.Treeview',
+                        background=COLORS['bg_card_hover'],
+                        fieldbackground=COLORS['bg_card'],
+                        foreground=COLORS['text_primary'],
+                        rowheight=40, borderwidth=0)
+        style.configure('Results.Treeview.Heading',
+                        background=COLORS['bg_card'],
+                        foreground=COLORS['text_secondary'],
+                        font=('Microsoft YaHei', 10, 'bold'))
+        
+        self.tree = ttk.Treeview(list_frame, columns=('sel', 'hindi', 'translit', 'en_zh'),
+                                 show='headings', height=20, selectmode='none',
+                                 style='Results.Treeview')
+        for column, heading, width, stretch in (
+            ('sel', '✓', 40, False),
+            ('hindi', '印地语', 240, True),
+            ('translit', '转写', 180, True),
+            ('en_zh', '英语 | 中文', 260, True),
+        ):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=stretch,
+                             anchor='center' if column == 'sel' else 'w')
+        
+        # 印地语字体
+        self.tree.tag_configure('hindi', font=self._hindi_font)
         
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar = tk.Scrollbar(list_frame, orient="vertical", 
+                                command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
         
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        self.canvas_window = self.canvas.create_window((0, 0), 
-                                                      window=self.results_frame, 
-                                                      anchor="nw",
-                                                      width=self.canvas.winfo_width())
-        
-        self.results_frame.bind("<Configure>", self.on_frame_configure)
-        self.canvas.bind("<Configure>", self.on_canvas_configure)
+        self.tree.bind("<Button-1>", self.on_tree_click)
         
         # 生成按钮
         self.generate_btn = ModernButton(results_card, 
@@ -224,13 +289,20 @@ class YouTubeFrame(tk.Frame):
         self.generate_btn.pack(pady=20)
         self.generate_btn.pack_forget()  # 初始隐藏
         
-    def on_frame_configure(self, event=None):
-        """更新canvas滚动区域"""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+    def on_tree_click(self, event):
+        """点击勾选列切换片段选中状态"""
+        if self.tree.identify_column(event.x) != '#1':
+            return
+        row = self.tree.identify_row(event.y)
+        if not row:
+            return
         
-    def on_canvas_configure(self, event):
-        """更新canvas窗口宽度"""
-        self.canvas.itemconfig(self.canvas_window, width=event.width)
+        index = int(row)
+        if index in self.selected_indices:
+            self.selected_indices.discard(index)
+        else:
+            self.selected_indices.add(index)
+        self.tree.set(row, 'sel', self.CHECK_MARKS[index in self.selected_indices])
         
     def update_progress(self, step_key, status, progress_value=None):
         """更新进度"""
@@ -280,173 +352,153 @@ class YouTubeFrame(tk.Frame):
     def process_video(self, url):
         """处理视频（后台线程）"""
         try:
-            # 初始化组件
-            from modules.youtube_handler import YouTubeHandler, check_ffmpeg, setup_ffmpeg_path
-            from modules.translator import HindiTranslator
-            from modules.whisper_engine import WhisperEngine
-            from modules.database import VocabDatabase
+            if not YOUTUBE_AVAILABLE:
+                raise RuntimeError("YouTube依赖未安装（yt-dlp / faster-whisper）")
             
             # 检查并设置FFmpeg
             if not check_ffmpeg():
-                self.after(0, lambda: self.set_status("正在安装FFmpeg..."))
+                self._ui_q.put(lambda: self.set_status("正在安装FFmpeg..."))
                 from install_ffmpeg import install_ffmpeg
                 if install_ffmpeg():
                     setup_ffmpeg_path()
             
-            self.youtube_handler = YouTubeHandler()
-            self.translator = HindiTranslator()
-            self.db = VocabDatabase()
+            # 初始化组件（只创建一次，再次分析时复用）
+            if self.youtube_handler is None:
+                self.youtube_handler = YouTubeHandler()
+            if self.db is None:
+                self.db = VocabDatabase()
+            if self.translator is None:
+                self.translator = HindiTranslator(db=self.db)
             
             # 1. 下载音频
-            self.after(0, lambda: self.update_progress('download', 'running', 10))
-            self.after(0, lambda: self.set_status("正在下载音频..."))
+            self._ui_q.put(lambda: self.update_progress('download', 'running', 10))
+            self._ui_q.put(lambda: self.set_status("正在下载音频..."))
             self.video_info = self.youtube_handler.download_audio(url)
             
-            self.after(0, lambda: self.video_info_label.config(
+            self._ui_q.put(lambda: self.video_info_label.config(
                 text=f"📹 {self.video_info['title']}\n⏱️ 时长: {self.video_info['duration']}秒"
             ))
-            self.after(0, lambda: self.update_progress('download', 'done', 25))
+            self._ui_q.put(lambda: self.update_progress('download', 'done', 25))
             
             # 2. Whisper转录
-            self.after(0, lambda: self.update_progress('transcribe', 'running', 30))
-            self.after(0, lambda: self.set_status("正在加载Whisper模型（首次需要下载）..."))
-            self.whisper_engine = WhisperEngine()
+            self._ui_q.put(lambda: self.update_progress('transcribe', 'running', 30))
+            self._ui_q.put(lambda: self.set_status("正在加载Whisper模型（首次需要下载）..."))
+            self.whisper_engine = WhisperManager.get_engine()
             
-            self.after(0, lambda: self.set_status("正在转录音频（这可能需要几分钟）..."))
-            hindi_text = self.whisper_engine.transcribe(self.video_info['audio_path'])
+            self._ui_q.put(lambda: self.set_status(
+                f"正在转录音频 ({self.whisper_engine.device.upper()}, "
+                f"{self.whisper_engine.compute_type})，这可能需要几分钟..."))
+            transcript = self.whisper_engine.transcribe_segments(
+                self.video_info['audio_path'], word_timestamps=True)
             
-            self.after(0, lambda: self.update_progress('transcribe', 'done', 60))
+            self._ui_q.put(lambda: self.update_progress('transcribe', 'done', 60))
             
-            # 3. 自动分段（简化版：整段作为一个片段）
-            self.after(0, lambda: self.update_progress('segment', 'running', 65))
-            self.after(0, lambda: self.set_status("正在分段..."))
+            # 3. 自动分段（按词级时间戳的停顿和句末标点切分）
+            self._ui_q.put(lambda: self.update_progress('segment', 'running', 65))
+            self._ui_q.put(lambda: self.set_status("正在分段..."))
             
-            # 这里简化处理，实际应该按句子分割
-            self.segments = [{
-                'start': 0,
-                'end': self.video_info['duration'],
-                'text': hindi_text
-            }]
+            self.segments = split_segments(transcript)
+            if not self.segments:
+                raise RuntimeError("未识别到语音内容")
             
-            self.after(0, lambda: self.update_progress('segment', 'done', 75))
+            self._ui_q.put(lambda: self.update_progress('segment', 'done', 75))
             
             # 4. 翻译
-            self.after(0, lambda: self.update_progress('translate', 'running', 80))
-            self.after(0, lambda: self.set_status("正在翻译..."))
+            self._ui_q.put(lambda: self.update_progress('translate', 'running', 80))
+            self._ui_q.put(lambda: self.set_status("正在翻译..."))
             
-            for segment in self.segments:
-                result = self.translator.translate_full(segment['text'])
-                segment.update(result)
+            # 并发翻译：网络等待期间释放GIL，缓存命中会立即返回
+            # Translate concurrently; workers overlap network waits
+            total = len(self.segments)
+            with ThreadPoolExecutor(max_workers=min(8, total)) as executor:
+                futures = {
+                    executor.submit(self.translator.translate_full, segment['text']): segment
+                    for segment in self.segments
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    futures[future].update(future.result())
+                    self._ui_q.put(lambda d=done: self.update_progress(
+                        'translate', 'running', 80 + 20 * d // total))
+                    self._ui_q.put(lambda d=done: self.set_status(f"正在翻译... {d}/{total}"))
             
-            self.after(0, lambda: self.update_progress('translate', 'done', 100))
-            self.after(0, lambda: self.set_status("处理完成！"))
+            self._ui_q.put(lambda: self.update_progress('translate', 'done', 100))
+            self._ui_q.put(lambda: self.set_status("处理完成！"))
             
             # 显示结果
-            self.after(0, self.show_results)
+            self._ui_q.put(self.show_results)
             
         except Exception as e:
             error_msg = str(e)
-            self.after(0, lambda msg=error_msg: messagebox.showerror("错误", f"处理失败: {msg}"))
-            self.after(0, lambda msg=error_msg: self.set_status(f"错误: {msg}"))
+            self._ui_q.put(lambda msg=error_msg: messagebox.showerror("错误", f"处理失败: {msg}"))
+            self._ui_q.put(lambda msg=error_msg: self.set_status(f"错误: {msg}"))
             
     def show_results(self):
         """显示处理结果"""
         # 清空现有内容
-        for widget in self.results_frame.winfo_children():
-            widget.destroy()
+        self.tree.delete(*self.tree.get_children())
         
-        self.selected_segments = []
+        # 默认全选
+        self.selected_indices = set(range(len(self.segments)))
         
         # 添加每个片段
+        mark = self.CHECK_MARKS[True]
         for i, segment in enumerate(self.segments):
-            self.create_segment_item(i, segment)
+            self.tree.insert('', 'end', iid=str(i), tags=('hindi',), values=(
+                mark,
+                segment['hindi'],
+                segment['transliteration'],
+                f"{segment['english']} | {segment['chinese']}"
+            ))
             
         # 显示生成按钮
         self.generate_btn.pack(pady=20)
         
-    def create_segment_item(self, index, segment):
-        """创建片段条目"""
-        item_frame = tk.Frame(self.results_frame, bg=COLORS['bg_card_hover'],
-                             highlightbackground=COLORS['border'],
-                             highlightthickness=1)
-        item_frame.pack(fill=tk.X, pady=5, padx=5)
-        
-        # 复选框
-        var = tk.BooleanVar(value=True)
-        self.selected_segments.append((var, segment))
-        
-        check = tk.Checkbutton(item_frame, variable=var,
-                              bg=COLORS['bg_card_hover'],
-                              activebackground=COLORS['bg_card_hover'],
-                              selectcolor=COLORS['primary'])
-        check.pack(side=tk.LEFT, padx=10)
-        
-        # 内容
-        content = tk.Frame(item_frame, bg=COLORS['bg_card_hover'])
-        content.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # 印地语（使用印地语字体）
-        hindi_font = font_manager.get_hindi_font(size=18, bold=True)
-        tk.Label(content, text=segment['hindi'], 
-                font=hindi_font,
-                fg=COLORS['text_primary'], 
-                bg=COLORS['bg_card_hover'],
-                wraplength=400).pack(anchor='w')
-        
-        # 转写
-        tk.Label(content, text=segment['transliteration'], 
-                font=('Segoe UI', 11),
-                fg=COLORS['accent'], 
-                bg=COLORS['bg_card_hover']).pack(anchor='w')
-        
-        # 英语和中文
-        tk.Label(content, text=f"{segment['english']} | {segment['chinese']}", 
-                font=('Microsoft YaHei', 10),
-                fg=COLORS['text_secondary'], 
-                bg=COLORS['bg_card_hover'],
-                wraplength=400).pack(anchor='w')
+    def refresh_check_marks(self):
+        """根据选中集合刷新勾选列"""
+        for row in self.tree.get_children():
+            self.tree.set(row, 'sel', self.CHECK_MARKS[int(row) in self.selected_indices])
         
     def select_all(self):
         """全选"""
-        for var, _ in self.selected_segments:
-            var.set(True)
+        self.selected_indices = set(range(len(self.segments)))
+        self.refresh_check_marks()
             
     def invert_selection(self):
         """反选"""
-        for var, _ in self.selected_segments:
-            var.set(not var.get())
+        self.selected_indices = set(range(len(self.segments))) - self.selected_indices
+        self.refresh_check_marks()
             
     def generate_cards(self):
         """生成学习卡片"""
-        selected = [(var.get(), seg) for var, seg in self.selected_segments if var.get()]
-        
-        if not selected:
+        if not self.selected_indices:
             messagebox.showwarning("警告", "请至少选择一个片段")
             return
             
-        # 保存到数据库
-        count = 0
-        for _, segment in selected:
-            try:
-                segment_path = self.youtube_handler.extract_segment(
-                    self.video_info['audio_path'],
-                    segment['start'],
-                    segment['end']
-                )
-                
-                lesson_id = self.db.add_youtube_lesson(
-                    video_url=self.video_info.get('video_id', ''),
-                    video_title=self.video_info['title'],
-                    segment_path=segment_path,
-                    start_time=segment['start'],
-                    end_time=segment['end'],
-                    hindi_text=segment['hindi'],
-                    transliteration=segment['transliteration'],
-                    english_text=segment['english'],
-                    chinese_text=segment['chinese']
-                )
-                count += 1
-            except Exception as e:
-                print(f"保存片段失败: {e}")
-                
-        messagebox.showinfo("成功", f"已生成 {count} 张学习卡片！\n可以在复习模式中找到它们。")
+        segments = [self.segments[i] for i in sorted(self.selected_indices)]
+        
+        # 分批用FFmpeg切出片段（切分失败的片段为None，直接跳过），再在一个事务中写入数据库
+        # Cut clips in bounded FFmpeg batches (failed clips come back as None and
+        # are skipped), then insert the rest in one transaction
+        try:
+            segment_paths = self.youtube_handler.extract_segments_batch(
+                self.video_info['audio_path'],
+                [(seg['start'], seg['end']) for seg in segments]
+            )
+            
+            count = self.db.add_youtube_lessons_bulk([
+                (self.video_info.get('video_id', ''), self.video_info['title'],
+                 segment_path, seg['start'], seg['end'], seg['hindi'],
+                 seg['transliteration'], seg['english'], seg['chinese'])
+                for seg, segment_path in zip(segments, segment_paths)
+                if segment_path
+            ])
+        except Exception as e:
+            print(f"保存片段失败: {e}")
+            messagebox.showerror("错误", f"保存片段失败: {e}")
+            return
+        
+        failed = len(segments) - count
+        message = f"已生成 {count} 张学习卡片！\n可以在复习模式中找到它们。"
+        if failed:
+            message += f"\n（{failed} 个片段切分失败，已跳过）"
+        messagebox.showinfo("成功", message)
@@ -6,9 +6,28 @@ FFmpeg Auto Installer for Windows
 """
 import os
 import sys
+import shutil
+import hashlib
 import zipfile
+import urllib.error
 import urllib.request
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
+# 只需要解压的可执行文件 / Only these executables are extracted
+BIN_MEMBERS = ('ffmpeg.exe', 'ffprobe.exe', 'ffplay.exe')
+
+# 下载地址（同目录下提供 .sha256 校验文件）
+# Archive URL; the build server publishes a matching .sha256 file
+DOWNLOAD_URL = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
+
+# 下载/解压分块大小 / Chunk size for download and extraction
+CHUNK_SIZE = 1 << 20
+
+# FFmpeg可用性缓存（只缓存成功结果）
+# Cached FFmpeg availability (positive results only)
+_FFMPEG_OK: Optional[bool] = None
 
 
 def install_ffmpeg():
@@ -27,48 +46,51 @@ def install_ffmpeg():
     ffmpeg_dir = base_dir / "ffmpeg"
     ffmpeg_dir.mkdir(exist_ok=True)
     
-    # 下载地址
-    download_url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
     zip_path = ffmpeg_dir / "ffmpeg.zip"
+    etag_path = ffmpeg_dir / ".etag"
+    bin_target = ffmpeg_dir / "bin"
+    bin_tmp = ffmpeg_dir / "bin_tmp"
     
     try:
-        # 下载
-        print("⬇️  Downloading FFmpeg...")
-        urllib.request.urlretrieve(download_url, zip_path)
-        print("✅ Download complete!\n")
+        # 下载（本地压缩包仍是最新版本时跳过）
+        fetch_archive(DOWNLOAD_URL, zip_path, etag_path)
         
-        # 解压
+        if not verify_archive(DOWNLOAD_URL, zip_path):
+            print("❌ Checksum mismatch, removing the downloaded archive")
+            zip_path.unlink()
+            if etag_path.exists():
+                etag_path.unlink()
+            return False
+        
+        # 只解压bin目录下的可执行文件，直接写入目标位置
         print("📦 Extracting...")
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(ffmpeg_dir)
-        print("✅ Extraction complete!\n")
+        if bin_tmp.exists():
+            shutil.rmtree(bin_tmp)
+        bin_tmp.mkdir()
         
-        # 找到解压后的文件夹
-        extracted_folder = None
-        for item in ffmpeg_dir.iterdir():
-            if item.is_dir() and item.name.startswith('ffmpeg-'):
-                extracted_folder = item
-                break
+        with zipfile.ZipFile(zip_path) as zip_ref:
+            # 顶层目录名（如 ffmpeg-7.1-essentials_build）直接取自压缩包目录
+            # Top-level folder name comes straight from the archive listing
+            top = zip_ref.namelist()[0].split('/', 1)[0]
+            for name in BIN_MEMBERS:
+                try:
+                    member = zip_ref.getinfo(f"{top}/bin/{name}")
+                except KeyError:
+                    continue
+                with zip_ref.open(member) as src, open(bin_tmp / name, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
         
-        if not extracted_folder:
-            print("❌ Could not find extracted FFmpeg folder")
+        if not (bin_tmp / "ffmpeg.exe").exists():
+            print("❌ Could not find FFmpeg executables in archive")
+            shutil.rmtree(bin_tmp)
             return False
+        print("✅ Extraction complete!\n")
         
-        # 创建bin目录的符号链接或复制文件
-        bin_source = extracted_folder / "bin"
-        bin_target = ffmpeg_dir / "bin"
-        
+        # 替换旧的bin目录
         if bin_target.exists():
-            import shutil
             shutil.rmtree(bin_target)
-        
-        # 复制bin目录
-        import shutil
-        shutil.copytree(bin_source, bin_target)
-        
-        # 清理
-        zip_path.unlink()
-        shutil.rmtree(extracted_folder)
+        bin_tmp.rename(bin_target)
+        invalidate_ffmpeg_cache()
         
         print("✅ FFmpeg installed successfully!")
         print(f"📁 Location: {bin_target}\n")
@@ -80,26 +102,93 @@ def install_ffmpeg():
         return False
 
 
-def check_ffmpeg():
-    """检查FFmpeg是否可用"""
-    import subprocess
+def fetch_archive(url: str, zip_path: Path, etag_path: Path):
+    """
+    下载FFmpeg压缩包，本地副本未变化时跳过
+    Download the FFmpeg archive unless the local copy is still current
+    
+    - 有ETag时发送 If-None-Match，服务器返回304则复用本地文件
+    - 没有ETag时用HEAD比较 Content-Length
+    """
+    headers = {}
+    if zip_path.exists():
+        if etag_path.exists():
+            headers['If-None-Match'] = etag_path.read_text().strip()
+        else:
+            request = urllib.request.Request(url, method='HEAD')
+            with urllib.request.urlopen(request) as response:
+                remote_len = response.headers.get('Content-Length')
+            if remote_len and int(remote_len) == zip_path.stat().st_size:
+                print("✅ Reusing downloaded archive\n")
+                return
+    
+    print("⬇️  Downloading FFmpeg...")
+    part_path = zip_path.with_suffix('.part')
+    try:
+        request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(request) as response, open(part_path, 'wb') as f:
+            shutil.copyfileobj(response, f, CHUNK_SIZE)
+            etag = response.headers.get('ETag')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print("✅ Archive unchanged, reusing local copy\n")
+            return
+        raise
+    
+    # 下载完整后再替换，避免半截文件被当作缓存
+    os.replace(part_path, zip_path)
+    if etag:
+        etag_path.write_text(etag)
+    elif etag_path.exists():
+        etag_path.unlink()
+    print("✅ Download complete!\n")
+
+
+def verify_archive(url: str, zip_path: Path) -> bool:
+    """
+    用服务器发布的SHA-256校验压缩包（取不到校验值时跳过）
+    Verify the archive against the published SHA-256 (skipped if unavailable)
+    """
     try:
-        # 先检查环境变量
-        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+        with urllib.request.urlopen(url + '.sha256') as response:
+            expected = response.read().decode('ascii').split()[0].lower()
+    except (urllib.error.URLError, IndexError, UnicodeDecodeError) as e:
+        print(f"⚠️  Could not fetch checksum, skipping verification: {e}")
         return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    
+    with open(zip_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            digest = hashlib.file_digest(f, 'sha256')
+        else:
+            # Python < 3.11
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+    
+    return digest.hexdigest() == expected
+
+
+def check_ffmpeg():
+    """检查FFmpeg是否可用"""
+    global _FFMPEG_OK
+    if _FFMPEG_OK is not None:
+        return _FFMPEG_OK
+    
+    # 先检查环境变量（只查找路径，不启动子进程）
+    if not shutil.which('ffmpeg'):
         # 检查项目本地目录
         base_dir = Path(__file__).parent.resolve()
         local_ffmpeg = base_dir / "ffmpeg" / "bin" / "ffmpeg.exe"
-        if local_ffmpeg.exists():
-            return True
-        return False
+        if not local_ffmpeg.exists():
+            return False
+    
+    _FFMPEG_OK = True
+    return True
 
 
+@lru_cache(maxsize=1)
 def get_ffmpeg_path():
     """获取FFmpeg可执行文件路径"""
-    import shutil
-    
     # 先检查系统PATH
     ffmpeg_exe = shutil.which('ffmpeg')
     if ffmpeg_exe:
@@ -114,6 +203,13 @@ def get_ffmpeg_path():
     return None
 
 
+def invalidate_ffmpeg_cache():
+    """清除FFmpeg检测缓存（安装或删除FFmpeg后调用）"""
+    global _FFMPEG_OK
+    _FFMPEG_OK = None
+    get_ffmpeg_path.cache_clear()
+
+
 def setup_ffmpeg_path():
     """设置FFmpeg路径到环境变量"""
     ffmpeg_bin = get_ffmpeg_path()
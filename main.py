@@ -12,10 +12,11 @@ Hindi Shadow Trainer - Main Application
 """
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt
@@ -29,16 +30,46 @@ from rich.rule import Rule
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 from config import Config
-from modules.shadowing import ShadowingSession
-from modules.review import ReviewMode
 from modules.database import VocabDatabase
 
 console = Console()
 
+# 主菜单可选项 / Main menu choices
+MENU_CHOICES = ["0", "1", "2", "3", "4", "5"]
+
+# 共享的数据库实例 / Shared database handle
+_DB = None
+
+
+def _get_db() -> VocabDatabase:
+    """获取共享的数据库实例"""
+    global _DB
+    if _DB is None:
+        _DB = VocabDatabase()
+    return _DB
+
+
+def get_statistics() -> dict:
+    """获取学习统计（数据未变化时不重新查询）"""
+    return _get_db().get_statistics_cached()
+
+
+def invalidate_statistics():
+    """跟读/复习使用各自的数据库实例写入，结束后使共享实例的统计缓存失效"""
+    _get_db().invalidate_stats()
+
+
+# 清屏方式在导入时确定一次：终端中直接输出控制序列，不再启动子进程
+# Resolved once: terminals get escape codes instead of spawning cls/clear
+if console.is_terminal:
+    _CLEAR_FN = console.clear
+else:
+    _CLEAR_FN = lambda: os.system('cls' if os.name == 'nt' else 'clear')
+
 
 def clear_screen():
     """清屏"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    _CLEAR_FN()
 
 
 def show_header():
@@ -55,16 +86,12 @@ def show_header():
     console.print(header)
 
 
-def show_menu():
-    """显示主菜单 - 简洁大方版本"""
-    # 获取今日待复习数量
-    db = VocabDatabase()
-    stats = db.get_statistics()
-    due_count = stats['due_today']
-    
-    # 创建选项卡片
-    options = []
-    
+@lru_cache(maxsize=2)
+def _build_menu(lang: str) -> tuple:
+    """
+    构建不随数据变化的菜单卡片（按语言缓存，切换语言时清除）
+    Build the static menu cards, cached per language
+    """
     # 选项1: 跟读训练
     shadowing_card = Panel(
         "[bold]🎙️  开始跟读[/bold]\n"
@@ -73,15 +100,41 @@ def show_menu():
         padding=(1, 2),
         width=25
     )
-    options.append(("1", shadowing_card))
     
+    # 选项3: 添加单词
+    add_card = Panel(
+        "[bold]➕ 添加单词[/bold]\n"
+        "[dim]添加新词汇[/dim]",
+        border_style="blue",
+        padding=(1, 2),
+        width=25
+    )
+    
+    # 选项5: 设置
+    settings_card = Panel(
+        "[bold]⚙️  设置[/bold]\n"
+        "[dim]语言等选项[/dim]",
+        border_style="white",
+        padding=(1, 2),
+        width=25
+    )
+    
+    exit_hint = Align.center("[dim]按 0 退出程序[/dim]")
+    
+    return shadowing_card, add_card, settings_card, exit_hint
+
+
+@lru_cache(maxsize=8)
+def _build_count_cards(due_count: int, total_words: int) -> tuple:
+    """
+    构建显示数量的菜单卡片（数量不变时直接复用）
+    Build the menu cards that show counts, reused while counts are unchanged
+    """
     # 选项2: 每日复习（显示数量）
-    review_text = f"[bold]📚 每日复习[/bold]\n[dim]"
     if due_count > 0:
-        review_text += f"[red]今日 {due_count} 个[/red]"
+        review_text = f"[bold]📚 每日复习[/bold]\n[dim][red]今日 {due_count} 个[/red][/dim]"
     else:
-        review_text += "今日无复习"
-    review_text += "[/dim]"
+        review_text = "[bold]📚 每日复习[/bold]\n[dim]今日无复习[/dim]"
     
     review_card = Panel(
         review_text,
@@ -89,46 +142,41 @@ def show_menu():
         padding=(1, 2),
         width=25
     )
-    options.append(("2", review_card))
-    
-    # 选项3: 添加单词
-    add_card = Panel(
-        "[bold]➕ 添加单词[/bold]\n"
-        "[dim]添加新词汇[/dim]",
-        border_style="blue",
-        padding=(1, 2),
-        width=25
-    )
-    options.append(("3", add_card))
     
     # 选项4: 统计
     stats_card = Panel(
         f"[bold]📊 学习统计[/bold]\n"
-        f"[dim]已掌握 {stats['total_words']} 词[/dim]",
+        f"[dim]已掌握 {total_words} 词[/dim]",
         border_style="magenta",
         padding=(1, 2),
         width=25
     )
-    options.append(("4", stats_card))
-    
-    # 选项5: 设置
-    settings_card = Panel(
-        "[bold]⚙️  设置[/bold]\n"
-        "[dim]语言等选项[/dim]",
-        border_style="white",
-        padding=(1, 2),
-        width=25
-    )
-    options.append(("5", settings_card))
     
-    # 显示选项网格
-    console.print()
-    console.print(Columns([card for _, card in options], equal=True))
+    return review_card, stats_card
+
+
+def show_menu():
+    """显示主菜单 - 简洁大方版本"""
+    # 获取今日待复习数量
+    stats = get_statistics()
+    due_count = stats['due_today']
     
-    # 显示退出选项
-    console.print()
-    console.print(Align.center("[dim]按 0 退出程序[/dim]"))
-    console.print()
+    shadowing_card, add_card, settings_card, exit_hint = _build_menu(Config.LANGUAGE)
+    
+    review_card, stats_card = _build_count_cards(due_count, stats['total_words'])
+    
+    # 选项网格和退出提示合并为一次输出
+    # Render the card grid and exit hint in a single print
+    console.print(Group(
+        Text(""),
+        Columns(
+            [shadowing_card, review_card, add_card, stats_card, settings_card],
+            equal=True
+        ),
+        Text(""),
+        exit_hint,
+        Text("")
+    ))
 
 
 def show_welcome():
@@ -186,8 +234,7 @@ def add_vocabulary():
     
     context = console.input("[dim]例句 (可选): [/dim]").strip() or None
     
-    db = VocabDatabase()
-    word_id = db.add_word(word, meaning, context)
+    word_id = _get_db().add_word(word, meaning, context)
     
     console.print()
     console.print(Panel(
@@ -200,10 +247,7 @@ def add_vocabulary():
 
 def show_statistics():
     """显示学习统计 - 图表版本"""
-    console.print()
-    
-    db = VocabDatabase()
-    stats = db.get_statistics()
+    stats = get_statistics()
     
     # 主统计面板
     main_stats = Table(show_header=False, box=box.SIMPLE)
@@ -216,36 +260,41 @@ def show_statistics():
     # 阶段分布
     stage_data = stats['stage_distribution']
     if stage_data:
-        stages_text = ""
-        for stage, count in sorted(stage_data.items()):
-            bar = "█" * count
-            stages_text += f"[dim]阶段 {stage}:[/dim] {bar} {count}\n"
+        stages_text = "\n".join(
+            f"[dim]阶段 {stage}:[/dim] {'█' * count} {count}"
+            for stage, count in sorted(stage_data.items())
+        )
     else:
         stages_text = "[dim]暂无数据[/dim]"
     
-    console.print(Panel(
-        main_stats,
-        title="[bold]学习统计[/bold]",
-        border_style="magenta",
-        padding=(1, 2)
-    ))
+    renderables = [
+        Text(""),
+        Panel(
+            main_stats,
+            title="[bold]学习统计[/bold]",
+            border_style="magenta",
+            padding=(1, 2)
+        )
+    ]
     
     if stage_data:
-        console.print()
-        console.print(Panel(
-            stages_text.strip(),
-            title="[bold]掌握程度分布[/bold]",
-            border_style="blue",
-            padding=(1, 2)
-        ))
+        renderables += [
+            Text(""),
+            Panel(
+                stages_text,
+                title="[bold]掌握程度分布[/bold]",
+                border_style="blue",
+                padding=(1, 2)
+            )
+        ]
+    
+    console.print(Group(*renderables))
     
     console.input("\n按回车继续...")
 
 
 def show_settings():
     """显示设置菜单 - 简洁版本"""
-    console.print()
-    
     # 当前设置
     current_lang = "中文" if Config.LANGUAGE == 'zh' else "English"
     
@@ -256,19 +305,23 @@ def show_settings():
     settings_table.add_row("🌐 语言", current_lang)
     settings_table.add_row("🤖 Whisper模型", Config.WHISPER_MODEL_SIZE)
     
-    console.print(Panel(
-        settings_table,
-        title="[bold]当前设置[/bold]",
-        border_style="yellow",
-        padding=(1, 2)
+    console.print(Group(
+        Text(""),
+        Panel(
+            settings_table,
+            title="[bold]当前设置[/bold]",
+            border_style="yellow",
+            padding=(1, 2)
+        ),
+        Text(""),
+        Text.from_markup(
+            "[dim]切换语言:[/dim]\n"
+            "  [cyan]1.[/cyan] 中文\n"
+            "  [cyan]2.[/cyan] English\n"
+            "  [cyan]0.[/cyan] 返回"
+        )
     ))
     
-    console.print()
-    console.print("[dim]切换语言:[/dim]")
-    console.print("  [cyan]1.[/cyan] 中文")
-    console.print("  [cyan]2.[/cyan] English")
-    console.print("  [cyan]0.[/cyan] 返回")
-    
     choice = Prompt.ask("\n选择", choices=["0", "1", "2"], default="0")
     
     if choice == "1":
@@ -279,6 +332,7 @@ def show_settings():
         console.print("[green]✓ Switched to English[/green]")
     
     if choice in ["1", "2"]:
+        _build_menu.cache_clear()
         console.input("\n按回车继续...")
 
 
@@ -294,20 +348,25 @@ def main():
             
             choice = Prompt.ask(
                 "[cyan]请选择[/cyan]",
-                choices=["0", "1", "2", "3", "4", "5"],
+                choices=MENU_CHOICES,
                 default="1"
             )
             
             if choice == "1":
                 clear_screen()
+                # 跟读/复习模块依赖音频、Whisper等重型库，用到时再导入
+                from modules.shadowing import ShadowingSession
                 session = ShadowingSession()
                 session.run()
+                invalidate_statistics()
                 console.input("\n按回车返回主菜单...")
                 
             elif choice == "2":
                 clear_screen()
+                from modules.review import ReviewMode
                 review = ReviewMode()
                 review.run()
+                invalidate_statistics()
                 console.input("\n按回车返回主菜单...")
                 
             elif choice == "3":
@@ -49,12 +49,14 @@ class ModernButton(tk.Canvas):
                         bg=COLORS['bg_card'], highlightthickness=0, **kwargs)
         
         self.text = text
+        self.font = font_manager.get_font('Segoe UI', 12, bold=True)
         self.command = command
         self.bg_color = bg_color or COLORS['primary']
         self.fg_color = fg_color or COLORS['text_primary']
         self.width = width
         self.height = height
         self.hovered = False
+        self._fill = self.bg_color
         
         self.draw()
         
@@ -64,41 +66,50 @@ class ModernButton(tk.Canvas):
         self.bind('<Button-1>', self.on_click)
         
     def draw(self):
-        """绘制按钮"""
+        """绘制按钮（创建时调用一次，之后只修改已有图元）"""
         self.delete('all')
         
-        # 圆角矩形
+        # 圆角矩形（背景图元统一打上 'bg' 标签，悬停时只改填充色）
         radius = 12
-        if self.hovered:
-            color = self._lighten_color(self.bg_color, 20)
-        else:
-            color = self.bg_color
-            
-        # 创建渐变效果（简化版）
         self.create_rounded_rect(2, 2, self.width-2, self.height-2, 
-                                radius, fill=color, outline='')
+                                radius, fill=self._fill, outline='', tags='bg')
         
         # 文字
-        self.create_text(self.width//2, self.height//2, text=self.text,
-                        fill=self.fg_color, font=('Segoe UI', 12, 'bold'))
+        self._text_id = self.create_text(self.width//2, self.height//2, text=self.text,
+                                         fill=self.fg_color, font=self.font)
+    
+    def set_text(self, text):
+        """更新按钮文字"""
+        if text != self.text:
+            self.text = text
+            self.itemconfig(self._text_id, text=text)
+    
+    def _set_fill(self, color):
+        """更新背景色，颜色不变时不做任何操作"""
+        if color != self._fill:
+            self._fill = color
+            self.itemconfig('bg', fill=color)
     
     def create_rounded_rect(self, x1, y1, x2, y2, radius, **kwargs):
-        """创建圆角矩形"""
-        points = [
-            x1+radius, y1,
-            x2-radius, y1,
-            x2, y1,
-            x2, y1+radius,
-            x2, y2-radius,
-            x2, y2,
-            x2-radius, y2,
-            x1+radius, y2,
-            x1, y2,
-            x1, y2-radius,
-            x1, y1+radius,
-            x1, y1,
+        """
+        创建圆角矩形：四个扇形角 + 两个交叉矩形（无需平滑多边形）
+        Rounded rectangle from four pieslice corners and two rectangles
+        """
+        d = radius * 2
+        corners = [
+            (x1, y1, x1+d, y1+d, 90),       # 左上 / top-left
+            (x2-d, y1, x2, y1+d, 0),        # 右上 / top-right
+            (x2-d, y2-d, x2, y2, 270),      # 右下 / bottom-right
+            (x1, y2-d, x1+d, y2, 180),      # 左下 / bottom-left
+        ]
+        items = [
+            self.create_arc(ax1, ay1, ax2, ay2, start=start, extent=90,
+                            style=tk.PIESLICE, **kwargs)
+            for ax1, ay1, ax2, ay2, start in corners
         ]
-        return self.create_polygon(points, smooth=True, **kwargs)
+        items.append(self.create_rectangle(x1+radius, y1, x2-radius, y2, **kwargs))
+        items.append(self.create_rectangle(x1, y1+radius, x2, y2-radius, **kwargs))
+        return items
     
     def _lighten_color(self, color, percent):
         """提亮颜色"""
@@ -107,11 +118,11 @@ class ModernButton(tk.Canvas):
     
     def on_enter(self, event):
         self.hovered = True
-        self.draw()
+        self._set_fill(self._lighten_color(self.bg_color, 20))
         
     def on_leave(self, event):
         self.hovered = False
-        self.draw()
+        self._set_fill(self.bg_color)
         
     def on_click(self, event):
         if self.command:
@@ -148,8 +159,9 @@ class HindiTrainerGUI:
         self.db = VocabDatabase()
         self.srs = SM2Algorithm()
         
-        # 当前视图
+        # 当前视图及已构建的视图（按名称缓存）
         self.current_frame = None
+        self.views = {}
         
         # 创建UI
         self.create_styles()
@@ -161,9 +173,23 @@ class HindiTrainerGUI:
         style = ttk.Style()
         style.theme_use('clam')
         
-        # 配置全局样式
-        style.configure('Custom.TFrame', background=COLORS['bg_dark'])
-        style.configure('Card.TFrame', background=COLORS['bg_card'])
+        # 常用字体只创建一次（Tk按名称缓存字体度量）
+        # Named fonts created once; Tk caches metrics per font object
+        self.fonts = {
+            'h1': font_manager.get_font('Microsoft YaHei', 32, bold=True),
+            'page_title': font_manager.get_font('Microsoft YaHei', 28, bold=True),
+            'h2': font_manager.get_font('Microsoft YaHei', 20, bold=True),
+            'app_title': font_manager.get_font('Microsoft YaHei', 16, bold=True),
+            'body_large': font_manager.get_font('Microsoft YaHei', 16),
+            'label_bold': font_manager.get_font('Microsoft YaHei', 14, bold=True),
+            'body': font_manager.get_font('Microsoft YaHei', 12),
+            'icon_large': font_manager.get_font('Segoe UI', 40),
+            'stat_value': font_manager.get_font('Segoe UI', 36, bold=True),
+            'icon': font_manager.get_font('Segoe UI', 24),
+            'subtitle': font_manager.get_font('Segoe UI', 14),
+            'text': font_manager.get_font('Segoe UI', 12),
+            'nav': font_manager.get_font('Segoe UI', 11)
+        }
         
     def create_main_layout(self):
         """创建主布局"""
@@ -189,11 +215,11 @@ class HindiTrainerGUI:
         title_frame = tk.Frame(header, bg=COLORS['bg_card'])
         title_frame.pack(side=tk.LEFT, padx=20, pady=10)
         
-        tk.Label(title_frame, text="🇮🇳", font=('Segoe UI', 24), 
+        tk.Label(title_frame, text="🇮🇳", font=self.fonts['icon'], 
                 bg=COLORS['bg_card']).pack(side=tk.LEFT)
         
         tk.Label(title_frame, text="印地语影子跟读训练器", 
-                font=('Microsoft YaHei', 16, 'bold'),
+                font=self.fonts['app_title'],
                 fg=COLORS['text_primary'], bg=COLORS['bg_card']).pack(side=tk.LEFT, padx=10)
         
         # 导航按钮
@@ -209,7 +235,7 @@ class HindiTrainerGUI:
         ]
         
         for text, command in nav_buttons:
-            btn = tk.Button(nav_frame, text=text, font=('Segoe UI', 11),
+            btn = tk.Button(nav_frame, text=text, font=self.fonts['nav'],
                           bg=COLORS['bg_card'], fg=COLORS['text_secondary'],
                           activebackground=COLORS['bg_card_hover'],
                           activeforeground=COLORS['text_primary'],
@@ -221,49 +247,72 @@ class HindiTrainerGUI:
             btn.bind('<Enter>', lambda e, b=btn: b.config(fg=COLORS['text_primary']))
             btn.bind('<Leave>', lambda e, b=btn: b.config(fg=COLORS['text_secondary']))
     
-    def clear_content(self):
-        """清空内容区域"""
-        if self.current_frame:
-            self.current_frame.destroy()
-        self.current_frame = tk.Frame(self.content_frame, bg=COLORS['bg_dark'])
-        self.current_frame.pack(fill=tk.BOTH, expand=True)
+    def _switch_to(self, name, build, refresh=None):
+        """
+        切换视图：每个视图只构建一次，之后通过隐藏/显示切换
+        Switch views; each view is built once and then shown/hidden
+        
+        Args:
+            name: 视图名称 / View name
+            build: 首次显示时构建控件的函数，参数为视图Frame
+            refresh: 每次显示前更新动态内容的函数（可选）
+        """
+        view = self.views.get(name)
+        if view is None:
+            view = tk.Frame(self.content_frame, bg=COLORS['bg_dark'])
+            build(view)
+            self.views[name] = view
+        
+        if refresh:
+            refresh()
+        
+        if self.current_frame is not view:
+            if self.current_frame:
+                self.current_frame.pack_forget()
+            view.pack(fill=tk.BOTH, expand=True)
+            self.current_frame = view
     
     def show_home(self):
         """显示首页"""
-        self.clear_content()
-        
+        self._switch_to('home', self._build_home, self._refresh_home)
+    
+    def _build_home(self, view):
+        """构建首页控件"""
         # 欢迎标题
-        welcome_frame = tk.Frame(self.current_frame, bg=COLORS['bg_dark'])
+        welcome_frame = tk.Frame(view, bg=COLORS['bg_dark'])
         welcome_frame.pack(fill=tk.X, pady=30)
         
         tk.Label(welcome_frame, text="欢迎回来！", 
-                font=('Microsoft YaHei', 32, 'bold'),
+                font=self.fonts['h1'],
                 fg=COLORS['text_primary'], bg=COLORS['bg_dark']).pack()
         
         tk.Label(welcome_frame, text="继续你的印地语学习之旅", 
-                font=('Segoe UI', 14),
+                font=self.fonts['subtitle'],
                 fg=COLORS['text_secondary'], bg=COLORS['bg_dark']).pack(pady=10)
         
-        # 统计卡片
-        stats = self.db.get_statistics()
-        
-        stats_frame = tk.Frame(self.current_frame, bg=COLORS['bg_dark'])
+        # 统计卡片（数值在 _refresh_home 中更新）
+        stats_frame = tk.Frame(view, bg=COLORS['bg_dark'])
         stats_frame.pack(fill=tk.X, pady=20)
         
-        # 创建统计卡片
-        self.create_stat_card(stats_frame, "📚", str(stats['total_words']), 
+        self.stat_vars = {
+            'total': tk.StringVar(value="0"),
+            'due': tk.StringVar(value="0"),
+            'mastered': tk.StringVar(value="0"),
+        }
+        self.create_stat_card(stats_frame, "📚", self.stat_vars['total'], 
                              "总词汇", COLORS['primary'])
-        self.create_stat_card(stats_frame, "📅", str(stats['due_today']), 
-                             "待复习", COLORS['warning'] if stats['due_today'] > 0 else COLORS['success'])
-        self.create_stat_card(stats_frame, "🏆", str(stats['stage_distribution'].get(5, 0)), 
+        # 待复习数值的颜色随数量变化 / Due count colour depends on the value
+        self.due_value_label = self.create_stat_card(stats_frame, "📅", self.stat_vars['due'], 
+                                                     "待复习", COLORS['success'])
+        self.create_stat_card(stats_frame, "🏆", self.stat_vars['mastered'], 
                              "已掌握", COLORS['success'])
         
         # 快速操作区
-        action_frame = tk.Frame(self.current_frame, bg=COLORS['bg_dark'])
+        action_frame = tk.Frame(view, bg=COLORS['bg_dark'])
         action_frame.pack(fill=tk.X, pady=40)
         
         tk.Label(action_frame, text="快速开始", 
-                font=('Microsoft YaHei', 20, 'bold'),
+                font=self.fonts['h2'],
                 fg=COLORS['text_primary'], bg=COLORS['bg_dark']).pack(anchor='w', padx=50)
         
         # 操作按钮
@@ -278,13 +327,34 @@ class HindiTrainerGUI:
                     command=self.show_youtube,
                     bg_color=COLORS['accent']).pack(side=tk.LEFT, padx=10)
         
-        if stats['due_today'] > 0:
-            ModernButton(btn_frame, f"📚 复习单词 ({stats['due_today']})", 
-                        command=self.show_review,
-                        bg_color=COLORS['warning']).pack(side=tk.LEFT, padx=10)
+        # 复习按钮只在有待复习单词时显示
+        self.review_btn = ModernButton(btn_frame, "📚 复习单词", 
+                                       command=self.show_review,
+                                       bg_color=COLORS['warning'])
+    
+    def _refresh_home(self):
+        """更新首页统计数值"""
+        stats = self.db.get_statistics_cached()
+        due = stats['due_today']
+        
+        self.stat_vars['total'].set(str(stats['total_words']))
+        self.stat_vars['due'].set(str(due))
+        self.stat_vars['mastered'].set(str(stats['stage_distribution'].get(5, 0)))
+        self.due_value_label.config(fg=COLORS['warning'] if due > 0 else COLORS['success'])
+        
+        if due > 0:
+            self.review_btn.set_text(f"📚 复习单词 ({due})")
+            self.review_btn.pack(side=tk.LEFT, padx=10)
+        else:
+            self.review_btn.pack_forget()
     
-    def create_stat_card(self, parent, icon, value, label, color):
-        """创建统计卡片"""
+    def create_stat_card(self, parent, icon, value_var, label, color):
+        """
+        创建统计卡片，数值绑定到 value_var
+        
+        Returns:
+            数值标签 / The value label
+        """
         card = tk.Frame(parent, bg=COLORS['bg_card'], 
                        highlightbackground=COLORS['border'],
                        highlightthickness=1)
@@ -295,68 +365,83 @@ class HindiTrainerGUI:
         inner.pack(padx=30, pady=30)
         
         # 图标
-        tk.Label(inner, text=icon, font=('Segoe UI', 40),
+        tk.Label(inner, text=icon, font=self.fonts['icon_large'],
                 bg=COLORS['bg_card']).pack()
         
         # 数值
-        tk.Label(inner, text=value, font=('Segoe UI', 36, 'bold'),
-                fg=color, bg=COLORS['bg_card']).pack(pady=5)
+        value_label = tk.Label(inner, textvariable=value_var, font=self.fonts['stat_value'],
+                              fg=color, bg=COLORS['bg_card'])
+        value_label.pack(pady=5)
         
         # 标签
-        tk.Label(inner, text=label, font=('Microsoft YaHei', 12),
+        tk.Label(inner, text=label, font=self.fonts['body'],
                 fg=COLORS['text_secondary'], bg=COLORS['bg_card']).pack()
+        
+        return value_label
     
     def show_youtube(self):
         """显示YouTube学习界面"""
-        self.clear_content()
-        
+        self._switch_to('youtube', self._build_youtube)
+    
+    def _build_youtube(self, view):
+        """构建YouTube学习界面（处理状态在切换视图后保留）"""
         # 导入YouTube界面模块
         from gui_youtube import YouTubeFrame
-        youtube_frame = YouTubeFrame(self.current_frame, self)
+        youtube_frame = YouTubeFrame(view, self)
         youtube_frame.pack(fill=tk.BOTH, expand=True)
     
     def show_shadowing(self):
         """显示跟读训练界面"""
-        self.clear_content()
-        
-        tk.Label(self.current_frame, text="🎙️ 跟读训练", 
-                font=('Microsoft YaHei', 28, 'bold'),
+        self._switch_to('shadowing', self._build_shadowing)
+    
+    def _build_shadowing(self, view):
+        """构建跟读训练界面"""
+        tk.Label(view, text="🎙️ 跟读训练", 
+                font=self.fonts['page_title'],
                 fg=COLORS['text_primary'], bg=COLORS['bg_dark']).pack(pady=30)
         
-        tk.Label(self.current_frame, text="功能开发中...", 
-                font=('Segoe UI', 14),
+        tk.Label(view, text="功能开发中...", 
+                font=self.fonts['subtitle'],
                 fg=COLORS['text_secondary'], bg=COLORS['bg_dark']).pack()
     
     def show_review(self):
         """显示复习界面"""
-        self.clear_content()
-        
-        tk.Label(self.current_frame, text="📚 每日复习", 
-                font=('Microsoft YaHei', 28, 'bold'),
+        self._switch_to('review', self._build_review, self._refresh_review)
+    
+    def _build_review(self, view):
+        """构建复习界面"""
+        tk.Label(view, text="📚 每日复习", 
+                font=self.fonts['page_title'],
                 fg=COLORS['text_primary'], bg=COLORS['bg_dark']).pack(pady=30)
         
-        # 获取待复习单词
-        due_words = self.db.get_due_words()
-        
-        if not due_words:
-            tk.Label(self.current_frame, text="🎉 太棒了！今天没有需要复习的单词", 
-                    font=('Microsoft YaHei', 16),
-                    fg=COLORS['success'], bg=COLORS['bg_dark']).pack(pady=50)
+        self.review_status = tk.Label(view, bg=COLORS['bg_dark'])
+        self.review_status.pack(pady=20)
+    
+    def _refresh_review(self):
+        """更新待复习数量"""
+        due = self.db.get_statistics_cached()['due_today']
+        
+        if not due:
+            self.review_status.config(text="🎉 太棒了！今天没有需要复习的单词",
+                                      font=self.fonts['body_large'],
+                                      fg=COLORS['success'])
         else:
-            tk.Label(self.current_frame, text=f"今天有 {len(due_words)} 个单词需要复习", 
-                    font=('Segoe UI', 14),
-                    fg=COLORS['text_secondary'], bg=COLORS['bg_dark']).pack()
+            self.review_status.config(text=f"今天有 {due} 个单词需要复习",
+                                      font=self.fonts['subtitle'],
+                                      fg=COLORS['text_secondary'])
     
     def show_settings(self):
         """显示设置界面"""
-        self.clear_content()
-        
-        tk.Label(self.current_frame, text="⚙️ 设置", 
-                font=('Microsoft YaHei', 28, 'bold'),
+        self._switch_to('settings', self._build_settings)
+    
+    def _build_settings(self, view):
+        """构建设置界面"""
+        tk.Label(view, text="⚙️ 设置", 
+                font=self.fonts['page_title'],
                 fg=COLORS['text_primary'], bg=COLORS['bg_dark']).pack(pady=30)
         
         # 语言设置
-        settings_frame = tk.Frame(self.current_frame, bg=COLORS['bg_card'],
+        settings_frame = tk.Frame(view, bg=COLORS['bg_card'],
                                  highlightbackground=COLORS['border'],
                                  highlightthickness=1)
         settings_frame.pack(fill=tk.X, padx=100, pady=20)
@@ -364,10 +449,10 @@ class HindiTrainerGUI:
         inner = tk.Frame(settings_frame, bg=COLORS['bg_card'])
         inner.pack(padx=30, pady=30)
         
-        tk.Label(inner, text="界面语言", font=('Microsoft YaHei', 14, 'bold'),
+        tk.Label(inner, text="界面语言", font=self.fonts['label_bold'],
                 fg=COLORS['text_primary'], bg=COLORS['bg_card']).pack(anchor='w')
         
-        tk.Label(inner, text="当前: 中文", font=('Segoe UI', 12),
+        tk.Label(inner, text="当前: 中文", font=self.fonts['text'],
                 fg=COLORS['text_secondary'], bg=COLORS['bg_card']).pack(anchor='w', pady=10)
 
 
@@ -2,3 +2,13 @@
 Hindi Shadow Trainer - Modules Package
 印地语影子跟读训练器 - 模块包
 """
+import sys
+from pathlib import Path
+
+# 各子模块通过 "from config import ..." 导入项目根目录下的配置；
+# 在包初始化时确保根目录在sys.path中（只添加一次，不重复插入）
+# Submodules import root-level config; ensure the project root is on
+# sys.path once here instead of every submodule prepending it again
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
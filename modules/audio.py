@@ -2,39 +2,119 @@
 音频管理模块
 Audio management module - recording and playback
 """
+import os
 import sys
-import wave
+import shutil
+import asyncio
 import threading
 import time
-from pathlib import Path
-from typing import Optional
+import unicodedata
+from functools import lru_cache
+from typing import Optional, Tuple, TYPE_CHECKING
 
-import sounddevice as sd
-import numpy as np
-from pydub import AudioSegment
-from pydub.playback import play
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-from rich.live import Live
-from rich.layout import Layout
+# numpy / sounddevice / soundfile / pydub 在首次录音或播放时才导入，
+# 只浏览界面时不加载PortAudio等重型依赖
+# Heavy audio libraries are imported on first record/play
+if TYPE_CHECKING:
+    import numpy as np
 
-# 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import Config
+from config import Config, TextKey, BASE_DIR
 
-console = Console()
+# 按键结束录音的实现在导入时确定一次：Windows用msvcrt，其他系统用termios+select
+# Keyboard backend for stopping a recording, chosen once at import
+try:
+    import msvcrt
+    _KEYBOARD = 'windows'
+except ImportError:
+    try:
+        import select
+        import termios
+        import tty
+        _KEYBOARD = 'posix'
+    except ImportError:
+        _KEYBOARD = None
+
+# rich只在命令行录音界面中使用，首次需要时再导入（GUI启动时不加载）
+# rich is only needed for the CLI recording UI; import it on first use
+_console = None
+
+
+def _get_console():
+    """获取（按需创建）rich控制台 / Lazily create the rich console"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+@lru_cache(maxsize=4096)
+def _grapheme_count(text: str) -> int:
+    """
+    统计字形数（不计元音符号、鼻化符、静音符等组合标记）
+    Count graphemes, skipping combining marks (matras, anusvara, virama)
+    """
+    return sum(1 for ch in text if not unicodedata.category(ch).startswith('M'))
+
+
+# 录音界面的进度条/音量条按格数预先生成，每帧只做查表
+# Progress and volume bars prebuilt per fill level; each frame is a lookup
+_PROGRESS_BARS = tuple("█" * k + "░" * (30 - k) for k in range(31))
+_VOLUME_BARS = tuple("▓" * k + "░" * (20 - k) for k in range(21))
+
+_RECORDING_UI = """
+[bold]时间:[/bold] {elapsed:.1f}s / {duration}s
+[bold]进度:[/bold] [{progress_bar}] {progress:.0f}%
+
+[bold]音量:[/bold] [{volume_bar}] {volume:.0f}%
+
+[cyan]💡 提示: 朗读时保持音量在绿色区域最佳[/cyan]
+        """
+
+
+def _find_ffplay() -> Optional[str]:
+    """查找ffplay（系统PATH或项目自带）/ Locate ffplay on PATH or in the bundled ffmpeg"""
+    ffplay = shutil.which('ffplay')
+    if ffplay:
+        return ffplay
+    local_ffplay = BASE_DIR / "ffmpeg" / "bin" / "ffplay.exe"
+    if local_ffplay.exists():
+        return str(local_ffplay)
+    return None
 
 
 class AudioManager:
     """音频管理类 - 负责录音和播放"""
     
+    # 解码后音频的缓存条数 / Max decoded clips kept in memory
+    SEGMENT_CACHE_SIZE = 64
+    
     def __init__(self):
         self.sample_rate = Config.AUDIO_SAMPLE_RATE
         self.channels = Config.AUDIO_CHANNELS
         self.dtype = 'int16'
         self.stop_recording = threading.Event()
-        self.recording_data = []
+        # 预分配的录音缓冲区（按需扩大，多次录音复用）
+        # Preallocated recording buffer, grown on demand and reused
+        self._buf = None
+        self._buf_limit = 0
+        self._frames = 0
+        # 最近一次录音的float32单声道采样，可直接交给Whisper
+        # Last recording as float32 mono samples, ready for Whisper
+        self.last_recording = None
+        # 已解码采样缓存，键为 (路径, 修改时间)
+        # Decoded samples keyed by (path, mtime)
+        self._seg_cache = {}
+        # 录音界面面板只创建一次，之后每帧只替换内容
+        # Recording panel built once; each frame only swaps its content
+        self._ui_panel = None
+        # 键盘监听实现 / Keyboard monitor for the current platform
+        if _KEYBOARD == 'windows':
+            self._monitor_keyboard = self._monitor_windows
+        elif _KEYBOARD == 'posix':
+            self._monitor_keyboard = self._monitor_posix
+        else:
+            self._monitor_keyboard = None
         
     def calculate_duration(self, text: str) -> int:
         """
@@ -47,94 +127,110 @@ class AudioManager:
         Returns:
             建议的录音时长（秒）/ Recommended duration in seconds
         """
-        # 基本时长 + 每个字符的预留时间
+        # 基本时长 + 每个字形的预留时间（组合标记不单独计时）
         base_duration = Config.AUDIO_DURATION_DEFAULT
-        char_duration = len(text) * Config.AUDIO_DURATION_PER_CHAR
+        char_duration = _grapheme_count(text) * Config.AUDIO_DURATION_PER_CHAR
         return max(base_duration, int(char_duration))
     
     def _audio_callback(self, indata, frames, time_info, status):
-        """音频回调函数，实时收集录音数据"""
+        """音频回调函数，实时把录音数据写入缓冲区"""
         if status:
             print(f"音频状态: {status}")
-        self.recording_data.append(indata.copy())
+        start = self._frames
+        end = min(start + frames, self._buf_limit)
+        self._buf[start:end] = indata[:end - start]
+        self._frames = end
+        if end == self._buf_limit:
+            self.stop_recording.set()
     
     def _create_ui(self, duration, elapsed_time, volume_level):
-        """创建录音UI界面"""
-        layout = Layout()
-        
-        # 顶部提示
-        header = Panel(
-            f"[bold red]🔴 正在录音...[/bold red]\n"
-            f"[dim]按 [bold]空格键[/bold] 或 [bold]Enter[/bold] 结束录音[/dim]",
-            border_style="red"
-        )
+        """创建/更新录音UI界面"""
+        if self._ui_panel is None:
+            from rich.panel import Panel
+            self._ui_panel = Panel("", title="🎙️ 录音中", border_style="cyan")
         
-        # 进度条
         progress = min(elapsed_time / duration, 1.0)
-        progress_bar = "█" * int(progress * 30) + "░" * (30 - int(progress * 30))
-        
-        # 音量可视化
-        volume_bar = "▓" * int(volume_level * 20) + "░" * (20 - int(volume_level * 20))
-        
-        content = f"""
-[bold]时间:[/bold] {elapsed_time:.1f}s / {duration}s
-[bold]进度:[/bold] [{progress_bar}] {progress*100:.0f}%
-
-[bold]音量:[/bold] [{volume_bar}] {volume_level*100:.0f}%
-
-[cyan]💡 提示: 朗读时保持音量在绿色区域最佳[/cyan]
-        """
-        
-        panel = Panel(
-            content,
-            title="🎙️ 录音中",
-            border_style="cyan"
+        self._ui_panel.renderable = _RECORDING_UI.format(
+            elapsed=elapsed_time,
+            duration=duration,
+            progress_bar=_PROGRESS_BARS[int(progress * 30)],
+            progress=progress * 100,
+            volume_bar=_VOLUME_BARS[int(volume_level * 20)],
+            volume=volume_level * 100
         )
-        
-        return panel
+        return self._ui_panel
+    
+    # 键盘监听（在新线程中运行）：按空格键或Enter结束录音
+    # 不使用阻塞读取：录音结束后阻塞的线程仍会吞掉下一次按键；
+    # 等待stop_recording代替sleep，录音一结束线程立即退出
+    # Keyboard monitors run in a thread; space or Enter stops the recording.
+    # They poll instead of blocking so no keypress is swallowed afterwards
+    
+    def _monitor_windows(self):
+        """Windows: 用msvcrt轮询按键"""
+        while not self.stop_recording.wait(0.1):
+            if msvcrt.kbhit():
+                key = msvcrt.getch()
+                # 空格键(32) 或 Enter键(13)
+                if key in [b' ', b'\r']:
+                    self.stop_recording.set()
+                    break
     
-    def _monitor_keyboard(self):
-        """监控键盘输入（在新线程中运行）"""
+    def _monitor_posix(self):
+        """Linux/Mac: 终端切换到cbreak模式后用select等待按键"""
+        if not sys.stdin.isatty():
+            return
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
         try:
-            import msvcrt  # Windows only
+            tty.setcbreak(fd)
             while not self.stop_recording.is_set():
-                if msvcrt.kbhit():
-                    key = msvcrt.getch()
-                    # 空格键(32) 或 Enter键(13)
-                    if key in [b' ', b'\r']:
-                        self.stop_recording.set()
-                        break
-                time.sleep(0.1)
-        except ImportError:
-            # Linux/Mac 使用其他方式
-            pass
+                ready, _, _ = select.select([fd], [], [], 0.1)
+                if ready and os.read(fd, 1) in (b' ', b'\n'):
+                    self.stop_recording.set()
+                    break
+        finally:
+            # 恢复终端设置 / Restore terminal settings
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
     
-    def record(self, duration: int, output_path: str) -> bool:
+    def record(self, duration: int, output_path: Optional[str] = None) -> bool:
         """
         录制音频 - 带UI界面和按键结束功能
         Record audio with UI and keyboard control
         
         Args:
             duration: 录音时长（秒）
-            output_path: 输出文件路径
+            output_path: 输出文件路径（为空时只保留在内存中的 last_recording）
             
         Returns:
             是否成功 / Success status
         """
+        import numpy as np
+        import sounddevice as sd
+        from rich.live import Live
+        console = _get_console()
+        
+        self.last_recording = None
         try:
-            console.print(f"\n🎙️  {Config.get_text('recording_ready')}")
+            console.print(f"\n🎙️  {Config.get_text(TextKey.RECORDING_READY)}")
             console.print("[dim]准备开始，请按任意键...[/dim]")
             input()  # 等待用户准备就绪
             
             # 重置状态
+            max_frames = int(duration * self.sample_rate)
+            if self._buf is None or len(self._buf) < max_frames:
+                self._buf = np.empty((max_frames, self.channels), dtype=self.dtype)
+            self._buf_limit = max_frames
+            self._frames = 0
             self.stop_recording.clear()
-            self.recording_data = []
             start_time = time.time()
             
             # 启动键盘监听线程
-            keyboard_thread = threading.Thread(target=self._monitor_keyboard)
-            keyboard_thread.daemon = True
-            keyboard_thread.start()
+            keyboard_thread = None
+            if self._monitor_keyboard is not None:
+                keyboard_thread = threading.Thread(target=self._monitor_keyboard)
+                keyboard_thread.daemon = True
+                keyboard_thread.start()
             
             # 开始录音
             stream = sd.InputStream(
@@ -146,37 +242,54 @@ class AudioManager:
             
             with stream:
                 with Live(refresh_per_second=10) as live:
-                    while not self.stop_recording.is_set():
-                        elapsed = time.time() - start_time
-                        
-                        # 检查是否超时
-                        if elapsed >= duration:
+                    # 缓冲区写满时回调会置位stop_recording，这里只读取写入位置刷新界面
+                    # The callback sets stop_recording once the buffer is full;
+                    # this loop only polls the write offset to drive the UI
+                    while not self.stop_recording.wait(0.1):
+                        # 设备没有送来数据时按墙钟时间兜底退出
+                        if time.time() - start_time >= duration + 1:
                             break
                         
-                        # 计算音量
+                        frames = self._frames
+                        elapsed = frames / self.sample_rate
+                        
+                        # 计算音量：最近0.1秒的均方根（缓冲区切片不复制）
+                        # RMS of the last 100 ms, read from a zero-copy slice of the buffer
                         volume = 0.0
-                        if self.recording_data:
-                            recent_data = np.concatenate(self.recording_data[-5:]) if len(self.recording_data) >= 5 else np.concatenate(self.recording_data)
-                            volume = min(np.abs(recent_data).mean() / 32768.0 * 5, 1.0)  # 放大音量显示
+                        if frames:
+                            window = self._buf[max(0, frames - self.sample_rate // 10):frames]
+                            # einsum按块把int16转为float64再累加平方和，不生成整窗口的临时数组
+                            # einsum casts in small buffered chunks: no window-sized temporary
+                            rms = np.sqrt(np.einsum('ij,ij->', window, window, dtype=np.float64)
+                                          / window.size)
+                            volume = min(rms / 32768.0 * 5, 1.0)  # 放大音量显示
                         
                         # 更新UI
                         ui = self._create_ui(duration, elapsed, volume)
                         live.update(ui)
-                        
-                        time.sleep(0.1)
             
-            # 合并录音数据
-            if self.recording_data:
-                recording = np.concatenate(self.recording_data, axis=0)
+            # 通知键盘监听线程退出，等它恢复终端设置后再继续输出
+            # Stop the keyboard thread and let it restore the terminal first
+            self.stop_recording.set()
+            if keyboard_thread is not None:
+                keyboard_thread.join(timeout=1)
+            
+            # 已录制的数据就是缓冲区前frames帧
+            frames = self._frames
+            if frames:
+                recording = self._buf[:frames]
+                
+                # 转为[-1, 1)的float32单声道（复制出缓冲区，下次录音不会覆盖）
+                # float32 mono in [-1, 1), copied out of the reusable buffer
+                samples = recording[:, 0] if self.channels == 1 else recording.mean(axis=1)
+                self.last_recording = samples.astype(np.float32) / np.float32(32768.0)
                 
-                # 保存为WAV文件
-                with wave.open(output_path, 'wb') as wf:
-                    wf.setnchannels(self.channels)
-                    wf.setsampwidth(2)  # int16 = 2 bytes
-                    wf.setframerate(self.sample_rate)
-                    wf.writeframes(recording.tobytes())
+                if output_path:
+                    # 保存为WAV文件（libsndfile直接写入缓冲区数据）
+                    import soundfile as sf
+                    sf.write(output_path, recording, self.sample_rate, subtype='PCM_16')
                 
-                actual_duration = len(recording) / self.sample_rate
+                actual_duration = frames / self.sample_rate
                 console.print(f"[green]✅ 录音完成！时长: {actual_duration:.1f}秒[/green]\n")
                 return True
             else:
@@ -184,9 +297,43 @@ class AudioManager:
                 return False
                 
         except Exception as e:
-            console.print(f"[red]❌ {Config.get_text('error_microphone')}: {e}[/red]")
+            self.stop_recording.set()
+            console.print(f"[red]❌ {Config.get_text(TextKey.ERROR_MICROPHONE)}: {e}[/red]")
             return False
     
+    def _load_audio(self, audio_path: str) -> Tuple['np.ndarray', int]:
+        """
+        加载并缓存解码后的采样数据，重复播放时不再解码
+        Decode audio to samples once and reuse them on replays
+        
+        Returns:
+            (采样数组, 采样率) / (samples, sample rate)
+        """
+        key = (audio_path, os.path.getmtime(audio_path))
+        cached = self._seg_cache.get(key)
+        if cached is None:
+            import numpy as np
+            import soundfile as sf
+            try:
+                # libsndfile直接解码WAV/MP3 / libsndfile decodes WAV and MP3 in-process
+                cached = sf.read(audio_path, dtype='int16')
+            except RuntimeError:
+                # 其他格式（如M4A）交给pydub/ffmpeg / Other formats go through pydub
+                from pydub import AudioSegment
+                audio = AudioSegment.from_file(audio_path)
+                samples = np.array(audio.get_array_of_samples())
+                cached = (samples.reshape(-1, audio.channels), audio.frame_rate)
+            if len(self._seg_cache) >= self.SEGMENT_CACHE_SIZE:
+                self._seg_cache.pop(next(iter(self._seg_cache)))
+            self._seg_cache[key] = cached
+        return cached
+    
+    def _play_array(self, data: 'np.ndarray', sample_rate: int):
+        """在进程内播放采样数据（阻塞到播放结束）/ Play samples in-process"""
+        import sounddevice as sd
+        sd.play(data, sample_rate)
+        sd.wait()
+    
     def play(self, audio_path: str) -> bool:
         """
         播放音频文件（支持MP3/WAV）
@@ -199,16 +346,61 @@ class AudioManager:
             是否成功 / Success status
         """
         try:
-            # 使用pydub加载和播放
-            # Load and play using pydub
-            audio = AudioSegment.from_file(audio_path)
-            play(audio)
+            # 加载（带缓存）后用sounddevice播放，不启动播放子进程
+            # Load (cached) and play via sounddevice, no player subprocess
+            data, sample_rate = self._load_audio(audio_path)
+            self._play_array(data, sample_rate)
             return True
             
         except Exception as e:
             print(f"❌ Error playing audio: {e}")
             return False
     
+    def can_stream(self) -> bool:
+        """是否支持流式播放（需要ffplay）/ Whether streaming playback is available"""
+        return _find_ffplay() is not None
+    
+    async def play_stream(self, chunks) -> bool:
+        """
+        流式播放MP3数据块，数据到达即开始播放
+        Play MP3 chunks through ffplay as they arrive
+        
+        Args:
+            chunks: 异步产出bytes的迭代器 / Async iterator of MP3 bytes
+            
+        Returns:
+            ffplay是否正常播放完毕 / Whether ffplay finished successfully
+            
+        Raises:
+            数据块产生失败（TTS、网络等）时结束ffplay并向上抛出异常
+            Errors from the chunk source (TTS, network, ...) propagate after ffplay is killed
+        """
+        ffplay = _find_ffplay()
+        if ffplay is None:
+            return False
+        
+        proc = await asyncio.create_subprocess_exec(
+            ffplay, '-nodisp', '-autoexit', '-loglevel', 'quiet', '-i', 'pipe:0',
+            stdin=asyncio.subprocess.PIPE
+        )
+        try:
+            async for chunk in chunks:
+                proc.stdin.write(chunk)
+                await proc.stdin.drain()
+        except BaseException:
+            proc.kill()
+            await proc.wait()
+            raise
+        finally:
+            # 立即关闭数据源（HindiTTS.stream会马上删除临时文件，而不是等到垃圾回收）
+            # Close the source now so HindiTTS.stream removes its temp file right away
+            aclose = getattr(chunks, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+        
+        proc.stdin.close()
+        return await proc.wait() == 0
+    
     def play_with_delay(self, audio_path: str, delay_ms: int = 500) -> bool:
         """
         播放音频并在结束后延迟
@@ -222,11 +414,11 @@ class AudioManager:
             是否成功 / Success status
         """
         try:
-            audio = AudioSegment.from_file(audio_path)
-            # 添加静音延迟
-            # Add silence delay
-            audio_with_delay = audio + AudioSegment.silent(duration=delay_ms)
-            play(audio_with_delay)
+            data, sample_rate = self._load_audio(audio_path)
+            self._play_array(data, sample_rate)
+            # 播放结束后直接等待，不再把静音拼接到整段采样后面（避免复制整个缓冲区）
+            # Wait after playback instead of copying the samples to append silence
+            time.sleep(delay_ms / 1000)
             return True
             
         except Exception as e:
@@ -3,25 +3,143 @@
 Database Module - SQLite Vocabulary Management
 """
 import sqlite3
-import sys
-from datetime import datetime, date
-from pathlib import Path
-from typing import List, Dict, Optional
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Optional, NamedTuple, Tuple
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config
 
+# 新词/新片段的首次复习在一天后 / First review is due one day after adding
+_ONE_DAY = timedelta(days=1)
+
+
+# 常用语句定义为模块常量：每次传入同一字符串，sqlite3的语句缓存总能命中
+# Hot statements as module constants so sqlite3's statement cache always hits
+SQL_ADD_WORD = '''
+    INSERT INTO vocab (word, meaning, context_sentence, next_review_date)
+    VALUES (?, ?, ?, ?)
+'''
+
+SQL_GET_DUE = '''
+    SELECT id, word, meaning, context_sentence, review_stage, next_review_date
+    FROM vocab
+    WHERE next_review_date <= ?
+    ORDER BY next_review_date ASC
+    LIMIT ?
+'''
+
+SQL_GET_DUE_BATCH = '''
+    SELECT id, word, meaning, review_stage, context_sentence
+    FROM vocab
+    WHERE next_review_date <= ?
+    ORDER BY next_review_date ASC
+    LIMIT ?
+'''
+
+SQL_UPDATE_REVIEW = '''
+    UPDATE vocab
+    SET review_stage = ?, next_review_date = ?, last_quality = ?
+    WHERE id = ?
+'''
+
+SQL_STATISTICS = '''
+    SELECT review_stage, COUNT(*),
+           SUM(CASE WHEN next_review_date <= ? THEN 1 ELSE 0 END)
+    FROM vocab
+    GROUP BY review_stage
+'''
+
+SQL_GET_TRANSLATION = '''
+    SELECT hindi, translit, en, zh FROM translations
+    WHERE hash = ? AND lang = ?
+'''
+
+SQL_CACHE_TRANSLATION = '''
+    INSERT OR REPLACE INTO translations
+    (hash, lang, hindi, translit, en, zh, ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+SQL_ADD_YOUTUBE_LESSON = '''
+    INSERT INTO youtube_lessons
+    (video_url, video_title, segment_path, start_time, end_time,
+     hindi_text, transliteration, english_text, chinese_text, next_review_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+SQL_UPDATE_YOUTUBE_REVIEW = '''
+    UPDATE youtube_lessons
+    SET review_stage = ?, next_review_date = ?, last_quality = ?
+    WHERE id = ?
+'''
+
+
+class DueBatch(NamedTuple):
+    """
+    按列存储的待复习单词（每个字段是等长元组）
+    Column-oriented batch of due words (parallel tuples)
+    """
+    ids: Tuple[int, ...]
+    words: Tuple[str, ...]
+    meanings: Tuple[str, ...]
+    stages: Tuple[int, ...]
+    contexts: Tuple[Optional[str], ...]
+    
+    def __len__(self):
+        return len(self.ids)
+
 
 class VocabDatabase:
     """生词本数据库类"""
     
+    # 翻译缓存有效期（天） / Translation cache TTL in days
+    TRANSLATION_TTL_DAYS = 14
+    
     def __init__(self):
         self.db_path = Config.DB_PATH
+        # 目录在首次使用时创建 / Create the data directory on first use
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 统计缓存（写操作后失效，跨日自动刷新）
+        # Statistics cache, dropped on writes and refreshed on a new day
+        self._stats_cache = None
+        self._stats_date = None
+        # 每个实例只打开一个连接，后台线程（如并发翻译）共用时由锁串行化
+        # One connection per instance; a lock serialises use from worker threads
+        self._lock = threading.RLock()
+        self._conn = None
         self._init_database()
     
+    @contextmanager
+    def _transaction(self):
+        """
+        获取共享连接并在一个事务中执行（正常结束提交，异常时回滚）
+        Use the shared connection inside one transaction (commit or roll back)
+        """
+        with self._lock, self._conn:
+            yield self._conn
+    
+    def close(self):
+        """关闭数据库连接 / Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
     def _init_database(self):
-        """初始化数据库表结构"""
-        with sqlite3.connect(self.db_path) as conn:
+        """打开连接并初始化数据库表结构"""
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL日志模式会持久保存在数据库文件中；WAL下synchronous=NORMAL即可保证安全
+        # WAL is persisted in the file; with WAL, synchronous=NORMAL stays durable
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        # 约20MB页缓存，一次复习会话中待复习集合常驻内存
+        # ~20 MB page cache so a session's due set stays in memory
+        self._conn.execute('PRAGMA cache_size=-20000')
+        
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # 创建生词表
@@ -60,7 +178,44 @@ class VocabDatabase:
                 )
             ''')
             
-            conn.commit()
+            # 待复习查询索引（按日期筛选、排序）
+            # Index for due-word lookups (filter and order by date)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_vocab_due
+                ON vocab (next_review_date, review_stage)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_yt_due
+                ON youtube_lessons (next_review_date)
+            ''')
+            
+            # 按视频查询/分组的索引
+            # Index for per-video lookups and grouping
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_yt_video
+                ON youtube_lessons (video_url, start_time)
+            ''')
+            
+            # 翻译缓存表（按句子哈希 + 目标语言）
+            # Translation cache keyed by sentence hash + target language
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    hash TEXT PRIMARY KEY,
+                    lang TEXT,
+                    hindi TEXT,
+                    translit TEXT,
+                    en TEXT,
+                    zh TEXT,
+                    ts INTEGER
+                )
+            ''')
+            
+            # 清理过期的翻译缓存
+            # Drop stale cached translations
+            cursor.execute(
+                'DELETE FROM translations WHERE ts < ?',
+                (int(time.time()) - self.TRANSLATION_TTL_DAYS * 86400,)
+            )
     
     def add_word(self, word: str, meaning: str, 
                  context_sentence: str = None) -> int:
@@ -76,44 +231,81 @@ class VocabDatabase:
         Returns:
             新单词的ID / New word ID
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # 设置明天为首次复习时间
             # Set tomorrow as first review date
-            tomorrow = date.today() + date.resolution
-            
-            cursor.execute('''
-                INSERT INTO vocab (word, meaning, context_sentence, 
-                                 next_review_date)
-                VALUES (?, ?, ?, ?)
-            ''', (word, meaning, context_sentence, tomorrow))
+            tomorrow = date.today() + _ONE_DAY
             
-            conn.commit()
+            cursor.execute(SQL_ADD_WORD, (word, meaning, context_sentence, tomorrow))
+            self.invalidate_stats()
             return cursor.lastrowid
     
-    def get_due_words(self) -> List[Dict]:
+    def add_words(self, items: List[Tuple]) -> int:
+        """
+        在一个事务中批量添加单词（导入词表时只提交一次）
+        Add many words in a single transaction (one commit per import)
+        
+        Args:
+            items: 每项为 (word, meaning, context_sentence)
+            
+        Returns:
+            插入的行数 / Number of rows inserted
+        """
+        tomorrow = date.today() + _ONE_DAY
+        
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(SQL_ADD_WORD, [(*item, tomorrow) for item in items])
+            self.invalidate_stats()
+            return cursor.rowcount
+    
+    def get_due_words(self, limit: Optional[int] = None) -> List[sqlite3.Row]:
         """
         获取今天需要复习的单词
         Get words due for review today
         
+        Args:
+            limit: 最多返回的数量，None表示全部 / Max rows, None for all
+            
         Returns:
-            单词列表 / List of words
+            单词行列表（可按列名访问） / Word rows, indexable by column name
         """
         today = date.today()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._transaction() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
-            cursor.execute('''
-                SELECT * FROM vocab 
-                WHERE next_review_date <= ?
-                ORDER BY next_review_date ASC
-            ''', (today,))
+            cursor.execute(SQL_GET_DUE, (today, -1 if limit is None else limit))
+            
+            # sqlite3.Row支持按列名和下标访问，无需再逐行复制为dict
+            # Rows already support access by name and index; no dict copies
+            return cursor.fetchall()
+    
+    def get_due_batch(self, limit: Optional[int] = None) -> DueBatch:
+        """
+        按列获取今天需要复习的单词
+        Get words due today as a column-oriented batch
+        
+        Args:
+            limit: 最多返回的数量，None表示全部 / Max rows, None for all
+            
+        Returns:
+            DueBatch，可按下标访问各列 / DueBatch indexed by position
+        """
+        today = date.today()
+        
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(SQL_GET_DUE_BATCH, (today, -1 if limit is None else limit))
             
             rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            if not rows:
+                return DueBatch((), (), (), (), ())
+            return DueBatch(*zip(*rows))
     
     def update_review(self, word_id: int, quality: int,
                       next_date: date, new_stage: int):
@@ -127,18 +319,31 @@ class VocabDatabase:
             next_date: 下次复习日期
             new_stage: 新的复习阶段
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE vocab 
-                SET review_stage = ?,
-                    next_review_date = ?,
-                    last_quality = ?
-                WHERE id = ?
-            ''', (new_stage, next_date, quality, word_id))
-            
-            conn.commit()
+            cursor.execute(SQL_UPDATE_REVIEW, (new_stage, next_date, quality, word_id))
+        self.invalidate_stats()
+    
+    def update_reviews_batch(self, reviews: List[Tuple]) -> int:
+        """
+        在一个事务中批量更新复习记录
+        Update many review records in a single transaction
+        
+        Args:
+            reviews: 每项为 (word_id, quality, next_date, new_stage)，与update_review参数顺序相同
+            
+        Returns:
+            更新的行数 / Number of rows updated
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(SQL_UPDATE_REVIEW, [
+                (new_stage, next_date, quality, word_id)
+                for word_id, quality, next_date, new_stage in reviews
+            ])
+        self.invalidate_stats()
+        return cursor.rowcount
     
     def get_statistics(self) -> Dict:
         """
@@ -150,27 +355,17 @@ class VocabDatabase:
         """
         today = date.today()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
-            # 总单词数
-            cursor.execute('SELECT COUNT(*) FROM vocab')
-            total = cursor.fetchone()[0]
-            
-            # 今天需要复习的
-            cursor.execute('''
-                SELECT COUNT(*) FROM vocab 
-                WHERE next_review_date <= ?
-            ''', (today,))
-            due_today = cursor.fetchone()[0]
+            # 一次扫描同时得到各阶段数量和其中今天到期的数量
+            # One pass: per-stage counts plus how many of each are due today
+            cursor.execute(SQL_STATISTICS, (today,))
+            rows = cursor.fetchall()
             
-            # 各阶段分布
-            cursor.execute('''
-                SELECT review_stage, COUNT(*) 
-                FROM vocab 
-                GROUP BY review_stage
-            ''')
-            stages = {row[0]: row[1] for row in cursor.fetchall()}
+            total = sum(row[1] for row in rows)
+            due_today = sum(row[2] for row in rows)
+            stages = {row[0]: row[1] for row in rows}
             
             return {
                 'total_words': total,
@@ -178,12 +373,72 @@ class VocabDatabase:
                 'stage_distribution': stages
             }
     
+    def get_statistics_cached(self) -> Dict:
+        """
+        获取学习统计（数据未变化时直接返回上次结果）
+        Get learning statistics, reusing the last result until data changes
+        """
+        today = date.today()
+        if self._stats_cache is None or self._stats_date != today:
+            self._stats_cache = self.get_statistics()
+            self._stats_date = today
+        return self._stats_cache
+    
+    def invalidate_stats(self):
+        """
+        使统计缓存失效（其他实例写入数据后也需调用）
+        Drop the statistics cache; also call after writes through another instance
+        """
+        self._stats_cache = None
+    
     def delete_word(self, word_id: int):
         """删除单词"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM vocab WHERE id = ?', (word_id,))
-            conn.commit()
+        self.invalidate_stats()
+    
+    # ========== Translation Cache Methods ==========
+    
+    def get_cached_translation(self, text_hash: str, lang: str) -> Optional[Dict]:
+        """
+        查询已缓存的翻译
+        Look up a cached translation
+        
+        Args:
+            text_hash: 原文的md5 / md5 of the source text
+            lang: 目标语言标识 / Target language key
+            
+        Returns:
+            translate_full格式的字典，未命中返回None / Dict or None on miss
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(SQL_GET_TRANSLATION, (text_hash, lang))
+            
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return {
+                'hindi': row[0],
+                'transliteration': row[1],
+                'english': row[2],
+                'chinese': row[3]
+            }
+    
+    def cache_translation(self, text_hash: str, lang: str, data: Dict):
+        """
+        写入翻译缓存
+        Store a translation in the cache
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(SQL_CACHE_TRANSLATION, (
+                text_hash, lang, data['hindi'], data['transliteration'],
+                data['english'], data['chinese'], int(time.time())
+            ))
     
     # ========== YouTube Lessons Methods ==========
     
@@ -194,33 +449,49 @@ class VocabDatabase:
         添加YouTube学习片段
         Add YouTube lesson segment
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # 设置明天为首次复习时间
-            tomorrow = date.today() + date.resolution
+            tomorrow = date.today() + _ONE_DAY
             
-            cursor.execute('''
-                INSERT INTO youtube_lessons 
-                (video_url, video_title, segment_path, start_time, end_time,
-                 hindi_text, transliteration, english_text, chinese_text, next_review_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (video_url, video_title, segment_path, start_time, end_time,
-                  hindi_text, transliteration, english_text, chinese_text, tomorrow))
-            
-            conn.commit()
+            cursor.execute(SQL_ADD_YOUTUBE_LESSON, (
+                video_url, video_title, segment_path, start_time, end_time,
+                hindi_text, transliteration, english_text, chinese_text, tomorrow
+            ))
             return cursor.lastrowid
     
-    def get_due_youtube_lessons(self) -> List[Dict]:
+    def add_youtube_lessons_bulk(self, lessons: List[Tuple]) -> int:
+        """
+        在一个事务中批量添加YouTube学习片段
+        Add many YouTube lesson segments in a single transaction
+        
+        Args:
+            lessons: 每项为 (video_url, video_title, segment_path, start_time,
+                     end_time, hindi_text, transliteration, english_text,
+                     chinese_text)
+            
+        Returns:
+            插入的行数 / Number of rows inserted
+        """
+        tomorrow = date.today() + _ONE_DAY
+        
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.executemany(SQL_ADD_YOUTUBE_LESSON, [(*lesson, tomorrow) for lesson in lessons])
+            return cursor.rowcount
+    
+    def get_due_youtube_lessons(self) -> List[sqlite3.Row]:
         """
         获取今天需要复习的YouTube课程
         Get YouTube lessons due for review today
         """
         today = date.today()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._transaction() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('''
                 SELECT * FROM youtube_lessons 
@@ -228,8 +499,7 @@ class VocabDatabase:
                 ORDER BY next_review_date ASC
             ''', (today,))
             
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return cursor.fetchall()
     
     def update_youtube_review(self, lesson_id: int, quality: int,
                               next_date: date, new_stage: int):
@@ -237,27 +507,19 @@ class VocabDatabase:
         更新YouTube课程复习记录
         Update YouTube lesson review record
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE youtube_lessons 
-                SET review_stage = ?,
-                    next_review_date = ?,
-                    last_quality = ?
-                WHERE id = ?
-            ''', (new_stage, next_date, quality, lesson_id))
-            
-            conn.commit()
+            cursor.execute(SQL_UPDATE_YOUTUBE_REVIEW, (new_stage, next_date, quality, lesson_id))
     
-    def get_youtube_lessons_by_video(self, video_url: str) -> List[Dict]:
+    def get_youtube_lessons_by_video(self, video_url: str) -> List[sqlite3.Row]:
         """
         获取特定视频的所有学习片段
         Get all lesson segments for a specific video
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._transaction() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('''
                 SELECT * FROM youtube_lessons 
@@ -265,17 +527,16 @@ class VocabDatabase:
                 ORDER BY start_time ASC
             ''', (video_url,))
             
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return cursor.fetchall()
     
-    def get_all_youtube_videos(self) -> List[Dict]:
+    def get_all_youtube_videos(self) -> List[sqlite3.Row]:
         """
         获取所有学习过的视频列表
         Get list of all studied videos
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._transaction() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('''
                 SELECT video_url, video_title, COUNT(*) as segment_count,
@@ -285,8 +546,7 @@ class VocabDatabase:
                 ORDER BY first_study DESC
             ''')
             
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+            return cursor.fetchall()
 
 
 if __name__ == "__main__":
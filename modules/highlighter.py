@@ -5,16 +5,14 @@ Text Highlighting Module
 使用Rich库在终端中显示带颜色的差异对比
 Use Rich library to display colored differences in terminal
 """
-import sys
-from pathlib import Path
+from collections import defaultdict, deque
 from typing import List, Tuple
 
 from rich.console import Console
 from rich.text import Text
 from rich.panel import Panel
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import Config
+from config import Config, TextKey
 from modules.scoring import PronunciationScorer
 
 
@@ -46,65 +44,56 @@ class TextHighlighter:
         s_words = standard.split()
         t_words = transcribed.split()
         
-        # 构建标准文本的高亮显示
-        # Build highlighted standard text
-        standard_text = Text()
+        # 先收集 (文本, 样式) 片段，最后各用一次Text.assemble构建
+        # Collect (text, style) parts, then build each Text once with assemble
+        standard_parts = []
         matched_indices = set()
         
-        # 找到匹配的单词位置
-        # Find matching word positions
-        for i, s_word in enumerate(s_words):
-            normalized_s = self.scorer._normalize_word(s_word)
-            found = False
-            
-            for j, t_word in enumerate(t_words):
-                if j in matched_indices:
-                    continue
-                normalized_t = self.scorer._normalize_word(t_word)
-                
-                if normalized_s == normalized_t:
-                    standard_text.append(f"{s_word} ", style="bold green")
-                    matched_indices.add(j)
-                    found = True
-                    break
-            
-            if not found:
+        # 转写单词按标准化结果分桶（每个词只标准化一次），桶内按出现顺序排列
+        # Bucket transcribed positions by normalized word, in order of appearance
+        buckets = defaultdict(deque)
+        for j, t_word in enumerate(t_words):
+            buckets[self.scorer._normalize_word(t_word)].append(j)
+        
+        # 找到匹配的单词位置：取同一单词最靠前的未匹配位置
+        # Find matching word positions: take the earliest unmatched occurrence
+        for s_word in s_words:
+            positions = buckets.get(self.scorer._normalize_word(s_word))
+            if positions:
+                matched_indices.add(positions.popleft())
+                standard_parts.append((f"{s_word} ", "bold green"))
+            else:
                 # 未匹配到，显示红色
                 # Not matched, show in red
-                standard_text.append(f"{s_word} ", style="bold red")
+                standard_parts.append((f"{s_word} ", "bold red"))
+        standard_text = Text.assemble(*standard_parts)
         
-        # 构建转写文本的显示
-        # Build transcribed text display
-        transcribed_text = Text()
-        for j, t_word in enumerate(t_words):
-            if j in matched_indices:
-                # 已匹配，显示绿色
-                # Matched, show in green
-                transcribed_text.append(f"{t_word} ", style="green")
-            else:
-                # 多余的单词，显示灰色
-                # Extra words, show in gray
-                transcribed_text.append(f"{t_word} ", style="dim")
+        # 构建转写文本的显示：已匹配的显示绿色，多余的单词显示灰色
+        # Build transcribed text: matched words in green, extra words in gray
+        transcribed_text = Text.assemble(*(
+            (f"{t_word} ", "green" if j in matched_indices else "dim")
+            for j, t_word in enumerate(t_words)
+        ))
         
         # 显示结果
         # Display results
         console.print()
         console.print(Panel(
             standard_text,
-            title=f"[bold cyan]{Config.get_text('standard_text')}[/bold cyan]",
+            title=f"[bold cyan]{Config.get_text(TextKey.STANDARD_TEXT)}[/bold cyan]",
             border_style="cyan"
         ))
         
         console.print(Panel(
             transcribed_text,
-            title=f"[bold cyan]{Config.get_text('your_pronunciation')}[/bold cyan]",
+            title=f"[bold cyan]{Config.get_text(TextKey.YOUR_PRONUNCIATION)}[/bold cyan]",
             border_style="blue"
         ))
         
         # 显示得分
         # Show score
         score_color = "green" if score >= 70 else "yellow" if score >= 50 else "red"
-        console.print(f"\n[bold]{Config.get_text('score_result')}:[/bold] [{score_color}]{score}%[/{score_color}]")
+        console.print(f"\n[bold]{Config.get_text(TextKey.SCORE_RESULT)}:[/bold] [{score_color}]{score}%[/{score_color}]")
         
         # 显示评级
         # Show rating
@@ -5,17 +5,18 @@ Review Mode Module
 实现每日生词复习功能，基于SM-2算法
 Implement daily vocabulary review based on SM-2 algorithm
 """
-import sys
+import sqlite3
+from datetime import date
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Optional
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import Config
+from config import Config, TextKey
+from modules.audio import AudioManager
 from modules.database import VocabDatabase
 from modules.tts import HindiTTS
 from modules.srs import SM2Algorithm
@@ -34,10 +35,19 @@ class ReviewMode:
         '4': ('easy', 5)
     }
     
+    # 复习结果先缓存，每满这么多条写入一次数据库
+    # Review results are buffered and written in batches of this size
+    REVIEW_FLUSH_SIZE = 20
+    
     def __init__(self):
         self.db = VocabDatabase()
         self.tts = HindiTTS()
         self.srs = SM2Algorithm()
+        self.audio_mgr = AudioManager()
+        self._pending = []
+        self._quality_menu = ""
+        self._next_review_fmt = ""
+        self._today = None
     
     def run(self):
         """运行复习模式"""
@@ -45,25 +55,57 @@ class ReviewMode:
         due_words = self.db.get_due_words()
         
         if not due_words:
-            console.print(f"[yellow]{Config.get_text('no_words_due')}[/yellow]")
+            console.print(f"[yellow]{Config.get_text(TextKey.NO_WORDS_DUE)}[/yellow]")
             return
         
         console.print(Panel(
-            f"[bold]{Config.get_text('words_due_count', len(due_words))}[/bold]",
+            f"[bold]{Config.get_text(TextKey.WORDS_DUE_COUNT, len(due_words))}[/bold]",
             border_style="green"
         ))
         
-        # 开始复习
-        for word_data in due_words:
-            self._review_word(word_data)
+        # 本次复习中不变的界面文本只查找一次
+        # Look up the UI strings once per session instead of once per word
+        get_text = Config.get_text
+        self._quality_menu = "\n".join([
+            "[bold]记忆程度?[/bold]",
+            "1. " + get_text(TextKey.QUALITY_FORGOT),
+            "2. " + get_text(TextKey.QUALITY_HARD),
+            "3. " + get_text(TextKey.QUALITY_GOOD),
+            "4. " + get_text(TextKey.QUALITY_EASY),
+        ])
+        self._next_review_fmt = get_text(TextKey.NEXT_REVIEW)
+        
+        # 整个复习会话使用同一个日期计算下次复习时间
+        # One date for the whole session's next-review calculations
+        self._today = date.today()
+        
+        # 复习开始前并发生成所有单词的发音
+        # Pre-synthesize every word's audio concurrently before the session
+        audio_paths = self.tts.synthesize_many([w['word'] for w in due_words])
+        
+        # 开始复习（中途退出时也写入已完成的结果）
+        # Start reviewing; results so far are written even if interrupted
+        try:
+            for word_data, audio_path in zip(due_words, audio_paths):
+                self._review_word(word_data, audio_path)
+                if len(self._pending) >= self.REVIEW_FLUSH_SIZE:
+                    self._flush_reviews()
+        finally:
+            self._flush_reviews()
         
         console.print("[green]✅ 复习完成！[/green]")
     
-    def _review_word(self, word_data: Dict):
-        """复习单个单词"""
+    def _flush_reviews(self):
+        """把缓存的复习结果在一个事务中写入数据库"""
+        if self._pending:
+            self.db.update_reviews_batch(self._pending)
+            self._pending = []
+    
+    def _review_word(self, word_data: sqlite3.Row, audio_path: Optional[Path] = None):
+        """复习单个单词（audio_path为预先生成的发音，没有时现场合成）"""
         word = word_data['word']
         meaning = word_data['meaning']
-        context = word_data.get('context_sentence', '')
+        context = word_data['context_sentence']
         current_stage = word_data['review_stage']
         
         # 显示单词
@@ -78,10 +120,9 @@ class ReviewMode:
         # 播放发音（使用TTS）
         # Play pronunciation using TTS
         try:
-            audio_path = self.tts.synthesize_sync(word)
-            from modules.audio import AudioManager
-            audio_mgr = AudioManager()
-            audio_mgr.play(str(audio_path))
+            if audio_path is None:
+                audio_path = self.tts.synthesize_sync(word)
+            self.audio_mgr.play(str(audio_path))
         except Exception as e:
             console.print(f"[dim]音频播放失败: {e}[/dim]")
         
@@ -95,33 +136,25 @@ class ReviewMode:
         quality = self._ask_quality()
         
         # 计算下次复习时间
-        result = self.srs.calculate_next_review(
-            current_stage,
-            quality,
-            word_data.get('last_interval')
-        )
+        result = self.srs.calculate_next_review(current_stage, quality, today=self._today)
         
-        # 更新数据库
-        self.db.update_review(
+        # 记录复习结果（由run批量写入数据库）
+        self._pending.append((
             word_data['id'],
             quality,
             result['next_date'],
             result['new_stage']
-        )
+        ))
         
         # 显示结果
         console.print(
-            f"[dim]{Config.get_text('next_review', result['next_date'])} "
+            f"[dim]{self._next_review_fmt.format(result['next_date'])} "
             f"(阶段 {result['new_stage']})[/dim]"
         )
     
     def _ask_quality(self) -> int:
         """询问用户记忆程度"""
-        console.print("[bold]记忆程度?[/bold]")
-        console.print("1. " + Config.get_text('quality_forgot'))
-        console.print("2. " + Config.get_text('quality_hard'))
-        console.print("3. " + Config.get_text('quality_good'))
-        console.print("4. " + Config.get_text('quality_easy'))
+        console.print(self._quality_menu)
         
         while True:
             choice = Prompt.ask(
@@ -5,23 +5,27 @@ Pronunciation Scoring Module
 使用Levenshtein距离计算文本相似度
 Calculate text similarity using Levenshtein distance
 """
-import sys
 import string
-from pathlib import Path
+from functools import lru_cache
 
-from Levenshtein import ratio
+from rapidfuzz.distance import Indel
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config
 
+# 删除ASCII标点的转换表（天城文字符不在其中，不受影响）
+# Translation table dropping ASCII punctuation; Devanagari is untouched
+_PUNCT_DROP = str.maketrans('', '', string.punctuation)
+
 
 class PronunciationScorer:
     """发音评分器"""
     
-    def calculate_score(self, standard: str, transcribed: str) -> float:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def calculate_score(standard: str, transcribed: str) -> float:
         """
-        计算发音相似度得分 (0-100)
-        Calculate pronunciation similarity score
+        计算发音相似度得分 (0-100)，结果按输入缓存（重试、高亮时不重复计算）
+        Calculate pronunciation similarity score, memoized per input pair
         
         Args:
             standard: 标准文本 / Standard text
@@ -32,20 +36,22 @@ class PronunciationScorer:
         """
         # 预处理文本
         # Preprocess text
-        s1 = self._normalize(standard)
-        s2 = self._normalize(transcribed)
+        s1 = PronunciationScorer._normalize(standard)
+        s2 = PronunciationScorer._normalize(transcribed)
         
-        # 如果都为空，认为是完全匹配
-        if not s1 and not s2:
+        # 完全相同（包括都为空）时直接满分，不必计算编辑距离
+        # Identical (including both empty): full marks without the DP
+        if s1 == s2:
             return 100.0
         
         # 如果标准为空但转写不为空，或反之，得分为0
         if not s1 or not s2:
             return 0.0
         
-        # 计算Levenshtein相似度
-        # Calculate Levenshtein similarity
-        similarity = ratio(s1, s2)
+        # 计算编辑距离相似度（与Levenshtein.ratio相同的Indel归一化，rapidfuzz用位并行SIMD实现）
+        # Edit-distance similarity: same Indel normalisation as Levenshtein.ratio,
+        # computed by rapidfuzz's bit-parallel SIMD kernel
+        similarity = Indel.normalized_similarity(s1, s2)
         return round(similarity * 100, 1)
     
     def get_word_accuracy(self, standard: str, transcribed: str) -> tuple:
@@ -59,21 +65,23 @@ class PronunciationScorer:
         words1 = standard.split()
         words2 = transcribed.split()
         
-        # 标准化后比较
-        w1 = [self._normalize_word(w) for w in words1]
-        w2 = [self._normalize_word(w) for w in words2]
+        # 标准化后放入集合，成员判断为O(1)
+        # Normalized standard words in a set for O(1) membership
+        w1 = {self._normalize_word(w) for w in words1}
         
         # 计算匹配的单词数
         # Count matching words
-        correct = sum(1 for w in w2 if w in w1)
-        total = len(w1)
+        correct = sum(1 for w in words2 if self._normalize_word(w) in w1)
+        total = len(words1)
         
         accuracy = (correct / total * 100) if total > 0 else 0
         return correct, total, round(accuracy, 1)
     
-    def _normalize(self, text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _normalize(text: str) -> str:
         """
-        文本标准化（参考项目逻辑）
+        文本标准化（参考项目逻辑，纯函数，结果缓存）
         Text normalization (from reference project)
         
         步骤:
@@ -81,19 +89,18 @@ class PronunciationScorer:
         2. 移除标点符号
         3. 统一空格
         """
-        # 转小写
-        text = text.lower().strip()
-        
-        # 移除标点符号
-        # Remove punctuation
-        text = ''.join(ch for ch in text if ch not in string.punctuation)
+        # 转小写并移除标点符号（str.translate在C层逐字符过滤）
+        # Lowercase and drop punctuation in one C-level translate pass
+        text = text.lower().translate(_PUNCT_DROP)
         
-        # 统一空格
-        # Normalize whitespace
+        # 统一空格（split()同时去掉首尾空白）
+        # Normalize whitespace; split() also trims both ends
         return ' '.join(text.split())
     
-    def _normalize_word(self, word: str) -> str:
-        """标准化单个单词"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_word(word: str) -> str:
+        """标准化单个单词（纯函数，跨句子缓存结果）"""
         return word.lower().strip(string.punctuation)
     
     def get_score_level(self, score: float) -> str:
@@ -0,0 +1,72 @@
+"""
+自动分段模块
+Automatic Segmentation Module
+
+根据Whisper的词级时间戳，把长转录切分为适合跟读的短句：
+1. 词与词之间的停顿超过阈值
+2. 句末标点（।  ?  !  .）
+"""
+from typing import List, Dict
+
+import numpy as np
+
+# 句末标点 / Sentence-ending punctuation
+SENTENCE_END = ('।', '॥', '?', '!', '.')
+
+# 视为句子边界的最短停顿（秒） / Minimum pause treated as a boundary (seconds)
+DEFAULT_GAP = 0.6
+
+
+def find_boundaries(starts: np.ndarray, ends: np.ndarray, gap: float) -> np.ndarray:
+    """
+    找出停顿超过阈值的位置
+    Find where the pause between consecutive words exceeds the threshold
+
+    Args:
+        starts: 每个词的开始时间 / Word start times
+        ends: 每个词的结束时间 / Word end times
+        gap: 停顿阈值（秒） / Pause threshold in seconds
+
+    Returns:
+        新片段起始词的下标 / Indices of words that begin a new segment
+    """
+    return np.flatnonzero(starts[1:] - ends[:-1] > gap) + 1
+
+
+def split_segments(transcript: List[Dict], gap: float = DEFAULT_GAP) -> List[Dict]:
+    """
+    按停顿和句末标点重新切分转录结果
+    Re-split a transcript at pauses and sentence-ending punctuation
+
+    Args:
+        transcript: transcribe_segments(word_timestamps=True) 的结果
+        gap: 停顿阈值（秒） / Pause threshold in seconds
+
+    Returns:
+        [{'start': 秒, 'end': 秒, 'text': 文本}, ...]
+    """
+    words = [word for segment in transcript for word in segment['words']]
+    if not words:
+        return []
+
+    count = len(words)
+    starts = np.fromiter((word[0] for word in words), np.float64, count)
+    ends = np.fromiter((word[1] for word in words), np.float64, count)
+    texts = [word[2] for word in words]
+
+    # 前一个词以句末标点结尾时，下一个词开始新句
+    punct = np.fromiter((text.strip().endswith(SENTENCE_END) for text in texts[:-1]),
+                        bool, count - 1)
+    cuts = np.union1d(find_boundaries(starts, ends, gap), np.flatnonzero(punct) + 1)
+    bounds = [0, *cuts.tolist(), count]
+
+    segments = []
+    for first, last in zip(bounds, bounds[1:]):
+        text = ''.join(texts[first:last]).strip()
+        if text:
+            segments.append({
+                'start': float(starts[first]),
+                'end': float(ends[last - 1]),
+                'text': text
+            })
+    return segments
@@ -9,23 +9,26 @@ Shadowing Mode Module
 4. Whisper识别
 5. 评分和高亮显示
 """
-import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional, Union, TYPE_CHECKING
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import Config
+from config import Config, TextKey
 from modules.audio import AudioManager
 from modules.tts import HindiTTS
-from modules.whisper_engine import WhisperEngine
+from modules.whisper_engine import WhisperManager, WHISPER_SAMPLE_RATE
 from modules.scoring import PronunciationScorer
 from modules.highlighter import TextHighlighter
 from modules.database import VocabDatabase
 
+if TYPE_CHECKING:
+    import numpy as np
+
 console = Console()
 
 
@@ -35,10 +38,13 @@ class ShadowingSession:
     def __init__(self):
         self.audio_mgr = AudioManager()
         self.tts = HindiTTS()
-        self.whisper = WhisperEngine()
+        # 模型在进程内只加载一次，再次进入跟读时直接复用
+        self.whisper = WhisperManager.get_engine()
         self.scorer = PronunciationScorer()
         self.highlighter = TextHighlighter()
         self.db = VocabDatabase()
+        # 识别线程池，每次run()时创建，结束时关闭
+        self._pool = None
     
     def run(self, text: str = None, audio_file: str = None):
         """
@@ -49,9 +55,21 @@ class ShadowingSession:
             text: 印地语文本（如不提供则使用音频文件）
             audio_file: 预录音频文件路径（可选）
         """
+        # 识别在后台线程进行，主线程保持进度动画刷新
+        # Transcription runs on a worker so the spinner keeps animating
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='transcribe')
+        try:
+            self._run(text, audio_file)
+        finally:
+            # 中断(Ctrl+C)时不等待正在进行的识别，直接退出
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    def _run(self, text: Optional[str], audio_file: Optional[str]):
+        """跟读训练各步骤"""
         # 获取文本
         if not text:
-            text = input(f"{Config.get_text('enter_hindi_text')}: ").strip()
+            text = input(f"{Config.get_text(TextKey.ENTER_HINDI_TEXT)}: ").strip()
         
         if not text:
             console.print("[red]❌ 请输入文本 / Please enter text[/red]")
@@ -67,13 +85,13 @@ class ShadowingSession:
         
         # 步骤3: 录音
         # Step 3: Record
-        recording_path = self._record_audio(text)
-        if not recording_path:
+        recording = self._record_audio(text)
+        if recording is None:
             return
         
         # 步骤4: 语音识别
         # Step 4: Speech recognition
-        transcribed = self._transcribe(recording_path)
+        transcribed = self._transcribe(recording)
         if not transcribed:
             return
         
@@ -88,7 +106,7 @@ class ShadowingSession:
     def _play_standard_audio(self, text: str, audio_file: str = None):
         """播放标准音频"""
         console.print(Panel(
-            f"[bold]{Config.get_text('standard_text')}:[/bold]\n{text}",
+            f"[bold]{Config.get_text(TextKey.STANDARD_TEXT)}:[/bold]\n{text}",
             border_style="cyan"
         ))
         
@@ -109,31 +127,51 @@ class ShadowingSession:
     
     def _countdown(self):
         """倒计时 3-2-1"""
+        # 提前生成所有提示文本，计时循环中只负责输出
+        lines = [
+            f"[bold yellow]{Config.get_text(TextKey.RECORDING_COUNTDOWN, i)}...[/bold yellow]"
+            for i in range(3, 0, -1)
+        ]
+        start_line = f"[bold green]{Config.get_text(TextKey.RECORDING_START)}[/bold green]"
+        
         console.print()
-        for i in range(3, 0, -1):
-            console.print(f"[bold yellow]{Config.get_text('recording_countdown', i)}...[/bold yellow]")
+        for line in lines:
+            console.print(line)
             time.sleep(1)
-        console.print(f"[bold green]{Config.get_text('recording_start')}[/bold green]")
+        console.print(start_line)
     
-    def _record_audio(self, text: str) -> str:
-        """录制用户发音"""
+    def _record_audio(self, text: str) -> Optional[Union[str, 'np.ndarray']]:
+        """
+        录制用户发音
+        采样率符合Whisper要求时直接返回内存中的采样，不写WAV文件
+        Returns in-memory samples when the rate suits Whisper, else a WAV path
+        """
         # 计算录音时长
         # Calculate recording duration
         duration = self.audio_mgr.calculate_duration(text)
         
         console.print(f"⏱️  录音时长: {duration}秒")
         
+        if self.audio_mgr.sample_rate == WHISPER_SAMPLE_RATE:
+            if not self.audio_mgr.record(duration):
+                return None
+            console.print(f"[bold]{Config.get_text(TextKey.RECORDING_STOP)}[/bold]")
+            return self.audio_mgr.last_recording
+        
+        # 其他采样率仍写入文件，由Whisper重新采样
+        # Other sample rates go through a file so Whisper can resample
         # 录音文件路径
+        Config.TTS_TEMP_DIR.mkdir(parents=True, exist_ok=True)
         recording_path = Config.TTS_TEMP_DIR / "user_recording.wav"
         
         # 开始录音
         if not self.audio_mgr.record(duration, str(recording_path)):
             return None
         
-        console.print(f"[bold]{Config.get_text('recording_stop')}[/bold]")
+        console.print(f"[bold]{Config.get_text(TextKey.RECORDING_STOP)}[/bold]")
         return str(recording_path)
     
-    def _transcribe(self, audio_path: str) -> str:
+    def _transcribe(self, audio_path: Union[str, 'np.ndarray']) -> str:
         """语音识别"""
         with Progress(
             SpinnerColumn(),
@@ -143,7 +181,8 @@ class ShadowingSession:
             task = progress.add_task("🔍 正在识别...", total=None)
             
             try:
-                transcribed = self.whisper.transcribe(audio_path)
+                # 进度动画由Progress自身的刷新线程驱动，这里直接阻塞等待结果
+                transcribed = self._pool.submit(self.whisper.transcribe, audio_path).result()
                 progress.update(task, completed=True)
                 return transcribed
             except Exception as e:
@@ -167,13 +206,13 @@ class ShadowingSession:
             console.print("[green]✅ 发音很好，不需要加入生词本[/green]")
             return
         
-        response = input(f"\n{Config.get_text('add_to_vocab')} (y/n): ").lower()
+        response = input(f"\n{Config.get_text(TextKey.ADD_TO_VOCAB)} (y/n): ").lower()
         
         if response == 'y':
-            meaning = input(f"{Config.get_text('enter_meaning')}: ")
+            meaning = input(f"{Config.get_text(TextKey.ENTER_MEANING)}: ")
             if meaning:
                 word_id = self.db.add_word(text, meaning)
-                console.print(f"[green]{Config.get_text('save_success')} ID: {word_id}[/green]")
+                console.print(f"[green]{Config.get_text(TextKey.SAVE_SUCCESS)} ID: {word_id}[/green]")
 
 
 if __name__ == "__main__":
@@ -5,13 +5,10 @@ SM-2 Spaced Repetition Algorithm Module
 SuperMemo-2算法简化版实现
 Simplified implementation of SuperMemo-2 algorithm
 """
-import sys
 from datetime import datetime, timedelta, date
-from typing import Dict
-from pathlib import Path
+from typing import Dict, Tuple
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import Config
+from config import Config, TextKey
 
 
 class SM2Algorithm:
@@ -35,11 +32,56 @@ class SM2Algorithm:
         # Initial intervals by stage
         self.intervals = Config.SRS_INTERVALS
         self.easiness_factor = Config.SRS_EASINESS_FACTOR
+        
+        # 与上次间隔无关的 (阶段, 质量) 组合预先算好：(新阶段, 间隔天数, timedelta)
+        # Precomputed results for (stage, quality) pairs that don't depend on
+        # last_interval: (new_stage, interval, timedelta)
+        self._lut = {}
+        for stage in range(6):
+            for quality in range(6):
+                if quality < 3 or min(stage + 1, 5) < len(self.intervals):
+                    new_stage, interval = self._next_stage(stage, quality, None)
+                    self._lut[(stage, quality)] = (new_stage, interval,
+                                                   timedelta(days=interval))
+    
+    def _next_stage(self, current_stage: int, quality: int,
+                    last_interval: int = None) -> Tuple[int, int]:
+        """
+        计算新阶段和间隔天数
+        Compute the new stage and interval in days
+        """
+        # 处理忘记的情况
+        # Handle forgotten case
+        if quality < 3:
+            # 忘记了，重置到第一阶段，隔天复习
+            # Forgotten, reset to stage 0, review tomorrow
+            return 0, 1
+        
+        # 记住的情况，进入下一阶段
+        # Remembered, advance to next stage
+        new_stage = min(current_stage + 1, 5)
+        
+        # 计算间隔天数
+        # Calculate interval
+        if new_stage < len(self.intervals):
+            # 使用预设间隔
+            # Use predefined intervals
+            interval = self.intervals[new_stage]
+        else:
+            # 超过预设阶段，使用EF因子增长
+            # Beyond predefined stages, use EF factor
+            if last_interval:
+                interval = int(last_interval * self.easiness_factor)
+            else:
+                interval = self.intervals[-1]
+        
+        return new_stage, interval
     
     def calculate_next_review(self, 
                             current_stage: int,
                             quality: int,
-                            last_interval: int = None) -> Dict:
+                            last_interval: int = None,
+                            today: date = None) -> Dict:
         """
         计算下次复习时间和新阶段
         Calculate next review date and new stage
@@ -57,6 +99,7 @@ class SM2Algorithm:
             current_stage: 当前复习阶段 (0-5)
             quality: 复习质量 (0-5)
             last_interval: 上次间隔天数（用于高级阶段）
+            today: 复习日期，批量复习时由调用方传入同一天（默认今天）
             
         Returns:
             dict: {
@@ -65,37 +108,15 @@ class SM2Algorithm:
                 'new_interval': 新间隔天数
             }
         """
-        # 处理忘记的情况
-        # Handle forgotten case
-        if quality < 3:
-            # 忘记了，重置到第一阶段，隔天复习
-            # Forgotten, reset to stage 0, review tomorrow
-            return {
-                'next_date': date.today() + timedelta(days=1),
-                'new_stage': 0,
-                'new_interval': 1
-            }
-        
-        # 记住的情况，进入下一阶段
-        # Remembered, advance to next stage
-        new_stage = min(current_stage + 1, 5)
-        
-        # 计算间隔天数
-        # Calculate interval
-        if new_stage < len(self.intervals):
-            # 使用预设间隔
-            # Use predefined intervals
-            interval = self.intervals[new_stage]
+        hit = self._lut.get((current_stage, quality))
+        if hit is not None:
+            new_stage, interval, delta = hit
         else:
-            # 超过预设阶段，使用EF因子增长
-            # Beyond predefined stages, use EF factor
-            if last_interval:
-                interval = int(last_interval * self.easiness_factor)
-            else:
-                interval = self.intervals[-1]
+            new_stage, interval = self._next_stage(current_stage, quality, last_interval)
+            delta = timedelta(days=interval)
         
         return {
-            'next_date': date.today() + timedelta(days=interval),
+            'next_date': (today or date.today()) + delta,
             'new_stage': new_stage,
             'new_interval': interval
         }
@@ -109,15 +130,15 @@ class SM2Algorithm:
             lang = Config.LANGUAGE
             
         quality_map = {
-            0: 'quality_forgot',
-            1: 'quality_forgot',
-            2: 'quality_forgot',
-            3: 'quality_hard',
-            4: 'quality_good',
-            5: 'quality_easy'
+            0: TextKey.QUALITY_FORGOT,
+            1: TextKey.QUALITY_FORGOT,
+            2: TextKey.QUALITY_FORGOT,
+            3: TextKey.QUALITY_HARD,
+            4: TextKey.QUALITY_GOOD,
+            5: TextKey.QUALITY_EASY
         }
         
-        key = quality_map.get(quality, 'quality_hard')
+        key = quality_map.get(quality, TextKey.QUALITY_HARD)
         return Config.get_text(key)
 
 
@@ -7,11 +7,13 @@ Hindi Translator Module
 2. 印地语 → 英语（deep-translator）
 3. 印地语 → 中文（deep-translator）
 """
-import sys
 import re
-from pathlib import Path
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from modules.database import VocabDatabase
 
 # 印地语到拉丁字母的简化映射表
 # Hindi to Latin simplified transliteration mapping
@@ -46,6 +48,20 @@ HINDI_TO_LATIN = {
 }
 
 
+# 多字符组合（连字、带附加符号的字母）编译成一个正则，一次扫描完成替换；
+# 长的排在前面，同一位置优先匹配最长的组合（无论组合有多长）。
+# 其余单字符通过str.translate在C层一次完成
+# All multi-character keys compile into one alternation, longest first, so a
+# single scan replaces them with leftmost-longest matching at any length;
+# single characters then go through one C-level str.translate pass
+_MULTI_CHAR_RE = re.compile('|'.join(
+    re.escape(k)
+    for k in sorted((k for k in HINDI_TO_LATIN if len(k) > 1), key=len, reverse=True)
+))
+_TRANSLIT_TABLE = str.maketrans({k: v for k, v in HINDI_TO_LATIN.items() if len(k) == 1})
+_WS_RE = re.compile(r'\s+')
+
+
 def transliterate_hindi(hindi_text: str) -> str:
     """
     印地语天城文 → 简化拉丁转写
@@ -56,41 +72,11 @@ def transliterate_hindi(hindi_text: str) -> str:
         भाई → bhai
         मेरा नाम → mera naam
     """
-    result = []
-    i = 0
-    text = hindi_text.strip()
-    
-    while i < len(text):
-        char = text[i]
-        
-        # 跳过空格
-        if char == ' ':
-            result.append(' ')
-            i += 1
-            continue
-        
-        # 尝试匹配双字符（如 क्ष, त्र, ज्ञ）
-        if i + 1 < len(text):
-            two_chars = text[i:i+2]
-            if two_chars in HINDI_TO_LATIN:
-                result.append(HINDI_TO_LATIN[two_chars])
-                i += 2
-                continue
-        
-        # 单字符匹配
-        if char in HINDI_TO_LATIN:
-            result.append(HINDI_TO_LATIN[char])
-        else:
-            # 保留未知字符（标点、数字等）
-            result.append(char)
-        
-        i += 1
+    text = _MULTI_CHAR_RE.sub(lambda m: HINDI_TO_LATIN[m.group()], hindi_text)
     
-    # 清理连续空格
-    transliterated = ''.join(result)
-    transliterated = re.sub(r'\s+', ' ', transliterated).strip()
-    
-    return transliterated
+    # 未知字符（标点等）原样保留；最后清理连续空格
+    # Unknown characters (punctuation etc.) pass through; collapse whitespace
+    return _WS_RE.sub(' ', text.translate(_TRANSLIT_TABLE)).strip()
 
 
 try:
@@ -100,21 +86,81 @@ except ImportError:
     TRANSLATOR_AVAILABLE = False
     print("Warning: deep_translator not installed. Translation features disabled.")
 
+# 中文翻译在线程池中与英文翻译同时请求（线程按需创建）；
+# 池中线程同样使用各自的翻译器实例
+# Chinese requests run on this pool while English runs on the caller's thread;
+# pool threads also use their own translator instances
+_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='translate')
+
 
 class HindiTranslator:
     """印地语翻译器"""
     
-    def __init__(self):
-        self.en_translator = None
-        self.zh_translator = None
+    # 缓存键中的目标语言标识 / Target-language part of the cache key
+    CACHE_LANG = 'en+zh-CN'
+    
+    # 逐句翻译结果合并时各字段的分隔符 / Per-field separators when merging sentences
+    FIELD_SEPARATORS = {
+        'hindi': ' ',
+        'transliteration': ' ',
+        'english': ' ',
+        'chinese': ''
+    }
+    
+    def __init__(self, db: VocabDatabase = None):
+        # 翻译缓存（SQLite） / SQLite-backed translation cache
+        self.db = db or VocabDatabase()
         
+        # GoogleTranslator把待翻译文本写入实例自身的请求参数，不是线程安全的，
+        # 因此每个线程使用各自的翻译器实例
+        # GoogleTranslator stores the text in per-instance request params and is
+        # not thread-safe, so every thread gets its own instances
+        self._local = threading.local()
+        self._available = False
         if TRANSLATOR_AVAILABLE:
             try:
-                self.en_translator = GoogleTranslator(source='hi', target='en')
-                self.zh_translator = GoogleTranslator(source='hi', target='zh-CN')
+                self._translators()
+                self._available = True
             except Exception as e:
                 print(f"Warning: Failed to initialize translators: {e}")
     
+    def _translators(self) -> tuple:
+        """当前线程的 (英文, 中文) 翻译器，首次使用时创建"""
+        translators = getattr(self._local, 'translators', None)
+        if translators is None:
+            translators = self._local.translators = (
+                GoogleTranslator(source='hi', target='en'),
+                GoogleTranslator(source='hi', target='zh-CN')
+            )
+        return translators
+    
+    def _translate(self, index: int, text: str) -> tuple:
+        """
+        用当前线程的翻译器翻译（0=英文，1=中文），失败时返回占位文本
+        Translate with this thread's translator (0=en, 1=zh); never raises
+        
+        Returns:
+            (译文, 是否失败) / (text, failed)
+        """
+        try:
+            return self._translators()[index].translate(text), False
+        except Exception as e:
+            if index == 0:
+                print(f"English translation failed: {e}")
+                return '[Translation failed]', True
+            print(f"Chinese translation failed: {e}")
+            return '[翻译失败]', True
+    
+    @property
+    def en_translator(self):
+        """当前线程的英文翻译器 / This thread's English translator"""
+        return self._translators()[0] if self._available else None
+    
+    @property
+    def zh_translator(self):
+        """当前线程的中文翻译器 / This thread's Chinese translator"""
+        return self._translators()[1] if self._available else None
+    
     def translate_full(self, hindi_text: str) -> dict:
         """
         完整翻译处理
@@ -128,6 +174,13 @@ class HindiTranslator:
             'chinese': '你好'
         }
         """
+        # 先查缓存，命中则无需联网
+        # Check the cache first; a hit skips the network round trip
+        text_hash = hashlib.md5(hindi_text.encode('utf-8')).hexdigest()
+        cached = self.db.get_cached_translation(text_hash, self.CACHE_LANG)
+        if cached is not None:
+            return cached
+        
         result = {
             'hindi': hindi_text,
             'transliteration': transliterate_hindi(hindi_text),
@@ -136,24 +189,40 @@ class HindiTranslator:
         }
         
         # 机器翻译
-        if self.en_translator and self.zh_translator:
-            try:
-                result['english'] = self.en_translator.translate(hindi_text)
-            except Exception as e:
-                print(f"English translation failed: {e}")
-                result['english'] = '[Translation failed]'
-            
-            try:
-                result['chinese'] = self.zh_translator.translate(hindi_text)
-            except Exception as e:
-                print(f"Chinese translation failed: {e}")
-                result['chinese'] = '[翻译失败]'
+        if self._available:
+            # 两个请求互不依赖，并发发出，耗时约为较慢的一个；
+            # 两边都经过_translate的异常处理，失败时得到占位文本
+            # The two requests are independent; run them concurrently. Both go
+            # through _translate's error handling and fall back to placeholders
+            zh_future = _POOL.submit(self._translate, 1, hindi_text)
+            result['english'], en_failed = self._translate(0, hindi_text)
+            result['chinese'], zh_failed = zh_future.result()
+            failed = en_failed or zh_failed
         else:
             result['english'] = '[Translator not available]'
             result['chinese'] = '[翻译器不可用]'
+            return result
+        
+        # 只缓存成功的翻译 / Only cache successful translations
+        if not failed:
+            self.db.cache_translation(text_hash, self.CACHE_LANG, result)
         
         return result
     
+    def translate_sentences(self, sentences: List[str]) -> dict:
+        """
+        逐句翻译后合并为一条四行结果
+        Translate sentence by sentence and merge into one four-line result
+        
+        每句单独查缓存/翻译，不必把整段文本拼接后再重新分词。
+        Each sentence hits the cache on its own; no re-tokenizing a joined blob.
+        """
+        results = [self.translate_full(sentence) for sentence in sentences if sentence]
+        return {
+            key: separator.join(result[key] for result in results)
+            for key, separator in self.FIELD_SEPARATORS.items()
+        }
+    
     def format_four_lines(self, data: dict) -> str:
         """
         格式化为四行显示
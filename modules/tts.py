@@ -3,21 +3,64 @@ TTS模块 - 使用Edge TTS生成印地语音频
 TTS Module - Using Edge TTS to generate Hindi audio
 """
 import asyncio
-import sys
+import hashlib
+import io
+import os
+import uuid
 from pathlib import Path
+from typing import List, Optional
 
 import edge_tts
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config
 
 
 class HindiTTS:
     """印地语TTS类"""
     
+    # 每个进程只清理一次缓存
+    _cache_pruned = False
+    
+    # 批量合成时的最大并发请求数 / Max concurrent Edge TTS requests in a batch
+    MAX_CONCURRENT = 8
+    
     def __init__(self):
         self.voice = Config.TTS_VOICE
         self.temp_dir = Config.TTS_TEMP_DIR
+        self.cache_dir = Config.TTS_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        if not HindiTTS._cache_pruned:
+            HindiTTS._cache_pruned = True
+            self._prune_cache()
+    
+    def _cache_path(self, text: str) -> Path:
+        """
+        根据(语音, 文本)计算缓存文件路径，按摘要前两位分到子目录
+        Cache file path keyed by SHA-1 of (voice, text), sharded by the
+        first two hex digits so no single directory grows too large
+        """
+        digest = hashlib.sha1(f"{self.voice}\n{text}".encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f"tts_{digest}.mp3"
+    
+    def _prune_cache(self):
+        """
+        按修改时间清理缓存，只保留最近使用的文件
+        Keep only the most recently used cache files (LRU on mtime)
+        """
+        try:
+            # 旧版本直接放在缓存根目录的文件不会再被命中，直接删除
+            # Files from the old flat layout are never hit again; drop them
+            for legacy in self.cache_dir.glob('tts_*.mp3'):
+                legacy.unlink()
+            
+            files = sorted(self.cache_dir.glob('*/tts_*.mp3'),
+                           key=lambda p: p.stat().st_mtime,
+                           reverse=True)
+            for stale in files[Config.TTS_CACHE_MAX_FILES:]:
+                stale.unlink()
+        except OSError as e:
+            print(f"Warning: TTS cache cleanup failed: {e}")
         
     async def synthesize(self, text: str, output_path: str = None) -> Path:
         """
@@ -31,18 +74,72 @@ class HindiTTS:
         Returns:
             生成的音频文件路径 / Path to generated audio file
         """
-        if not output_path:
-            # 生成临时文件名
-            output_path = self.temp_dir / f"tts_{hash(text)}.mp3"
-        else:
+        if output_path:
             output_path = Path(output_path)
+            communicate = edge_tts.Communicate(text, self.voice)
+            await communicate.save(str(output_path))
+            return output_path
         
-        # 使用edge-tts生成音频
-        # Use edge-tts to generate audio
+        # 命中缓存时直接返回，无需网络请求
+        # Cache hit: return without any network round-trip
+        cache_path = self._cache_path(text)
+        if cache_path.exists():
+            os.utime(cache_path)  # 更新修改时间，用于LRU清理
+            return cache_path
+        
+        # 使用edge-tts生成音频：数据块先收集在内存中，一次写入临时文件后原子替换
+        # Collect edge-tts chunks in memory, write once, then atomically move into place
+        buf = io.BytesIO()
         communicate = edge_tts.Communicate(text, self.voice)
-        await communicate.save(str(output_path))
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                buf.write(chunk["data"])
+        
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path = self._tmp_path(cache_path)
+        try:
+            tmp_path.write_bytes(buf.getbuffer())
+            os.replace(tmp_path, cache_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        
+        return cache_path
+    
+    async def stream(self, text: str):
+        """
+        流式合成：边接收边产出MP3数据块，完成后写入缓存
+        Stream synthesis: yield MP3 chunks as they arrive, then store in cache
+        
+        Args:
+            text: 要合成的文本 / Text to synthesize
+            
+        Yields:
+            MP3数据块 / MP3 byte chunks
+        """
+        cache_path = self._cache_path(text)
+        if cache_path.exists():
+            os.utime(cache_path)
+            yield cache_path.read_bytes()
+            return
         
-        return output_path
+        cache_path.parent.mkdir(exist_ok=True)
+        tmp_path = self._tmp_path(cache_path)
+        communicate = edge_tts.Communicate(text, self.voice)
+        try:
+            with open(tmp_path, 'wb') as f:
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        f.write(chunk["data"])
+                        yield chunk["data"]
+            os.replace(tmp_path, cache_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+    
+    def _tmp_path(self, cache_path: Path) -> Path:
+        """写入中的临时文件路径（唯一，避免并发冲突）"""
+        return cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex[:8]}.part")
     
     def synthesize_sync(self, text: str, output_path: str = None) -> Path:
         """
@@ -50,6 +147,30 @@ class HindiTTS:
         Synchronous version for easier calling
         """
         return asyncio.run(self.synthesize(text, output_path))
+    
+    def synthesize_many(self, texts: List[str]) -> List[Optional[Path]]:
+        """
+        并发合成多条文本（已缓存的直接命中），失败的项为None
+        Synthesize many texts concurrently; failed items come back as None
+        
+        Args:
+            texts: 要合成的文本列表 / Texts to synthesize
+            
+        Returns:
+            与texts一一对应的音频路径 / Audio paths in the same order as texts
+        """
+        async def _run():
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT)
+            
+            async def _one(text):
+                async with semaphore:
+                    return await self.synthesize(text)
+            
+            return await asyncio.gather(*(_one(t) for t in texts),
+                                        return_exceptions=True)
+        
+        return [None if isinstance(r, BaseException) else r
+                for r in asyncio.run(_run())]
 
 
 if __name__ == "__main__":
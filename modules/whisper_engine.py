@@ -2,18 +2,37 @@
 Whisper语音识别模块
 Whisper Speech Recognition Module
 
+使用faster-whisper (CTranslate2) 后端，默认int8量化
+Backed by faster-whisper (CTranslate2), int8 quantized by default
+
 参考项目逻辑 Reference project logic:
 - 必须使用 language='hi' 指定印地语
-- fp16=False 确保CPU兼容性
 """
 import os
-import sys
+import threading
 from pathlib import Path
+from typing import List, Dict, Union, TYPE_CHECKING
+
+import ctranslate2
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from faster_whisper.utils import download_model
+
+from config import Config, TextKey
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# faster-whisper直接接收numpy数组时要求16kHz float32单声道
+# Sample rate faster-whisper expects for raw float32 mono arrays
+WHISPER_SAMPLE_RATE = 16000
 
-import whisper
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import Config
+def _detect_device() -> str:
+    """检测可用的CUDA设备 / Use CUDA when a GPU is visible to CTranslate2"""
+    try:
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    except Exception:
+        return "cpu"
 
 
 class WhisperEngine:
@@ -21,8 +40,14 @@ class WhisperEngine:
     
     def __init__(self):
         self.model = None
+        self.batched_model = None
         self.model_size = Config.WHISPER_MODEL_SIZE
         self.model_dir = Config.WHISPER_MODEL_DIR
+        self.device = _detect_device()
+        # GPU上int8权重+fp16计算，CPU上int8 / int8_float16 on GPU, int8 on CPU
+        self.compute_type = Config.WHISPER_COMPUTE_TYPE or (
+            "int8_float16" if self.device == "cuda" else "int8"
+        )
         self._load_model()
     
     def _load_model(self):
@@ -31,57 +56,170 @@ class WhisperEngine:
         Load Whisper model with custom download directory
         """
         try:
-            print(f"📥 正在加载Whisper模型: {self.model_size}...")
+            print(f"📥 正在加载Whisper模型: {self.model_size} ({self.device}, {self.compute_type})...")
             print(f"📁 模型存储位置: {self.model_dir}")
+            self.model_dir.mkdir(parents=True, exist_ok=True)
             
-            # 设置模型下载目录
-            # Set model download directory
-            os.environ["WHISPER_CACHE_DIR"] = str(self.model_dir)
+            model_path = self._resolve_model_path()
+            print(f"✓ 模型快照位置: {model_path}")
             
-            # 加载模型
-            # Load model
-            self.model = whisper.load_model(
-                self.model_size,
+            # 加载模型（int8权重在CPU上比fp32快2-4倍）
+            # Load model (int8 weights run 2-4x faster than fp32 on CPU)
+            self.model = WhisperModel(
+                model_path,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=os.cpu_count() or 0,
                 download_root=str(self.model_dir)
             )
+            # 长音频使用批量推理管线（分块后批量编码/解码）
+            # Batched pipeline for long audio (chunks decoded in batches)
+            self.batched_model = BatchedInferencePipeline(model=self.model)
             
             print(f"✅ Whisper模型加载完成!")
             
         except Exception as e:
-            print(f"❌ {Config.get_text('error_whisper')}: {e}")
+            print(f"❌ {Config.get_text(TextKey.ERROR_WHISPER)}: {e}")
             raise
     
-    def transcribe(self, audio_path: str) -> str:
+    def _resolve_model_path(self) -> str:
+        """
+        解析本地模型快照路径，已下载时不访问网络
+        Resolve the local snapshot path, skipping the network when cached
+        """
+        if Path(self.model_size).is_dir():
+            return self.model_size
+        
+        try:
+            return download_model(self.model_size, local_files_only=True,
+                                  cache_dir=str(self.model_dir))
+        except Exception:
+            # 本地没有快照，首次下载
+            # No local snapshot yet, download it once
+            return download_model(self.model_size, cache_dir=str(self.model_dir))
+    
+    def transcribe(self, audio_path: Union[str, 'np.ndarray'], beam_size: int = 1,
+                   vad_filter: bool = True) -> str:
         """
         将音频转写为印地语文本
         Transcribe audio to Hindi text
         
         关键参数说明 Key parameters (from reference project):
         - language='hi': 强制使用印地语识别，提高准确率
-        - fp16=False: 禁用半精度浮点，确保CPU兼容性
+        - beam_size=1: 跟读录音很短，贪心解码配合int8量化延迟最低
+        - vad_filter=True: 去掉录音前后的静音，减少实际解码量
         
         Args:
-            audio_path: 音频文件路径 / Path to audio file
+            audio_path: 音频文件路径，或16kHz float32单声道数组（跳过文件解码）
+                        Path to audio file, or 16 kHz float32 mono samples
+            beam_size: 束搜索宽度 / Beam width (1 = greedy)
+            vad_filter: 是否用VAD跳过静音 / Skip silence with VAD
             
         Returns:
             转写的印地语文本 / Transcribed Hindi text
         """
         try:
-            print(f"🔍 {Config.get_text('transcribing')}")
+            print(f"🔍 {Config.get_text(TextKey.TRANSCRIBING)}")
             
-            # 使用参考项目的关键参数
-            # Use key parameters from reference project
-            result = self.model.transcribe(
+            # faster-whisper返回惰性的片段生成器，迭代时才真正解码
+            # faster-whisper returns a lazy segment generator; decoding runs on iteration
+            segments, _info = self.model.transcribe(
                 audio_path,
                 language='hi',      # 必须指定印地语
-                fp16=False          # CPU模式更安全
+                beam_size=beam_size,
+                vad_filter=vad_filter
             )
             
-            return result["text"].strip()
+            return ''.join(segment.text for segment in segments).strip()
             
         except Exception as e:
             print(f"❌ Transcription error: {e}")
             return ""
+    
+    def transcribe_segments(self, audio_path: str, batch_size: int = 16,
+                            vad_filter: bool = True,
+                            word_timestamps: bool = False) -> List[Dict]:
+        """
+        批量转写长音频，返回带时间戳的句子片段
+        Transcribe long audio in batches, returning timestamped segments
+        
+        Args:
+            audio_path: 音频文件路径 / Path to audio file
+            batch_size: 每批解码的音频块数 / Audio chunks decoded per batch
+            vad_filter: 是否用VAD跳过静音 / Skip silence with VAD
+            word_timestamps: 是否附带词级时间戳 / Include word timestamps
+            
+        Returns:
+            [{'start': 秒, 'end': 秒, 'text': 文本}, ...]
+            word_timestamps=True 时每项另有 'words': [(开始, 结束, 词), ...]
+        """
+        print(f"🔍 {Config.get_text(TextKey.TRANSCRIBING)}")
+        
+        segments, _info = self.batched_model.transcribe(
+            audio_path,
+            language='hi',
+            batch_size=batch_size,
+            vad_filter=vad_filter,
+            word_timestamps=word_timestamps
+        )
+        
+        results = []
+        for segment in segments:
+            item = {'start': segment.start, 'end': segment.end, 'text': segment.text.strip()}
+            if word_timestamps:
+                item['words'] = [(word.start, word.end, word.word) for word in segment.words]
+            results.append(item)
+        return results
+
+
+class WhisperManager:
+    """
+    Whisper引擎单例管理器
+    Process-wide WhisperEngine singleton
+
+    模型只加载一次，可在后台线程中预加载
+    The model is loaded once and can be preloaded on a background thread
+    """
+
+    _engine = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_engine(cls) -> WhisperEngine:
+        """获取（必要时加载）Whisper引擎 / Get the engine, loading it if needed"""
+        if cls._engine is None:
+            with cls._lock:
+                if cls._engine is None:
+                    cls._engine = WhisperEngine()
+        return cls._engine
+
+    @classmethod
+    def is_loaded(cls) -> bool:
+        """模型是否已加载 / Whether the model is ready"""
+        return cls._engine is not None
+
+    @classmethod
+    def preload(cls, on_done=None) -> threading.Thread:
+        """
+        在后台线程中预加载模型
+        Preload the model on a daemon thread
+
+        Args:
+            on_done: 加载结束后的回调，参数为异常或None
+                     Callback invoked with the exception (or None) when done
+        """
+        def _worker():
+            error = None
+            try:
+                cls.get_engine()
+            except Exception as e:
+                error = e
+            if on_done:
+                on_done(error)
+
+        thread = threading.Thread(target=_worker, daemon=True)
+        thread.start()
+        return thread
 
 
 if __name__ == "__main__":
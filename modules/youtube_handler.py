@@ -7,17 +7,23 @@ YouTube Handler Module
 2. 提取视频信息
 3. 音频切片
 """
-import sys
 import os
-import uuid
+import re
+import json
+import hashlib
 import subprocess
 import shutil
+from functools import lru_cache
 from pathlib import Path
-from pydub import AudioSegment
+from typing import List, Tuple, Optional, TYPE_CHECKING
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import Config
 
+# pydub只在没有FFmpeg、需要解码切分时才导入
+# pydub is only needed for the no-FFmpeg slicing fallback, so it is imported lazily
+if TYPE_CHECKING:
+    from pydub import AudioSegment
+
 # 尝试导入yt_dlp
 try:
     import yt_dlp
@@ -41,6 +47,7 @@ def setup_ffmpeg_path():
         # 添加到环境变量
         os.environ['PATH'] = str(local_ffmpeg_bin) + os.pathsep + os.environ.get('PATH', '')
         # 同时设置pydub需要的路径
+        from pydub import AudioSegment
         AudioSegment.converter = str(local_ffmpeg_bin / "ffmpeg.exe")
         AudioSegment.ffmpeg = str(local_ffmpeg_bin / "ffmpeg.exe")
         AudioSegment.ffprobe = str(local_ffmpeg_bin / "ffprobe.exe")
@@ -50,18 +57,56 @@ def setup_ffmpeg_path():
 
 
 def check_ffmpeg():
-    """检查是否安装了FFmpeg"""
+    """检查是否安装了FFmpeg（只在PATH中查找，不启动子进程）"""
+    return shutil.which('ffmpeg') is not None
+
+
+def _run_ffmpeg(cmd: List[str]):
+    """
+    运行FFmpeg命令：不接输入、丢弃标准输出，只收集（-loglevel error下很少的）错误输出
+    Run FFmpeg with no stdin, stdout discarded, stderr kept for errors
+    
+    Raises:
+        RuntimeError: FFmpeg失败，消息中包含其错误输出 / FFmpeg failed; message carries its stderr
+    """
     try:
-        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.PIPE, check=True)
+    except subprocess.CalledProcessError as e:
+        detail = (e.stderr or b'').decode(errors='replace').strip()
+        raise RuntimeError(f"FFmpeg failed (exit {e.returncode}): {detail}") from e
+
+
+@lru_cache(maxsize=2)
+def _load_full(audio_path: str, mtime: float, fmt: str) -> 'AudioSegment':
+    """
+    解码完整音频并缓存（同一文件切多个片段时只解码一次）
+    Decode a whole file once for repeated slicing; keyed by (path, mtime, format).
+    每项都是整段PCM，所以只保留两项 / Each entry is full PCM, so keep only two
+    """
+    from pydub import AudioSegment
+    
+    # 直接指定格式，不经过from_mp3等包装和格式探测 / Explicit format, no sniffing
+    return AudioSegment.from_file(audio_path, format=fmt)
+
+
+# 从链接中直接解析视频ID（watch?v=、youtu.be/、shorts/、embed/），无需请求网络
+# Video id parsed straight from the URL, no network round-trip
+_VIDEO_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([\w-]{11})')
+
+
+def parse_video_id(url: str) -> Optional[str]:
+    """从YouTube链接解析视频ID，无法识别时返回None"""
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
 
 class YouTubeHandler:
     """YouTube处理器"""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = True):
+        # verbose=False 时只输出警告和错误 / Only warnings and errors when not verbose
+        self.verbose = verbose
         self.temp_dir = Path(Config.TTS_TEMP_DIR) / "youtube"
         self.segments_dir = Path(Config.TTS_TEMP_DIR) / "segments"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
@@ -71,38 +116,88 @@ class YouTubeHandler:
         setup_ffmpeg_path()
         self.has_ffmpeg = check_ffmpeg()
     
-    def download_audio(self, url: str) -> dict:
+    def _log(self, *args):
+        """输出进度信息 / Print progress unless quiet"""
+        if self.verbose:
+            print(*args)
+    
+    def probe(self, url: str) -> dict:
+        """
+        只获取视频信息，不下载（已缓存元数据时不访问网络）
+        Fetch video metadata without downloading; served from the sidecar when cached
+        
+        Returns:
+            dict: {'video_id': 'xxx', 'title': '视频标题', 'duration': 754}
+        """
+        video_id = parse_video_id(url)
+        if video_id:
+            try:
+                meta = json.loads((self.temp_dir / f"{video_id}.json").read_text(encoding='utf-8'))
+                return {'video_id': video_id, **meta}
+            except (OSError, ValueError):
+                pass
+        
+        with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'skip_download': True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+        
+        video_id = info['id']
+        meta = {'title': info.get('title', 'Unknown'), 'duration': info.get('duration', 0)}
+        (self.temp_dir / f"{video_id}.json").write_text(json.dumps(meta, ensure_ascii=False),
+                                                        encoding='utf-8')
+        return {'video_id': video_id, **meta}
+    
+    def download_audio(self, url: str, start: float = None, end: float = None) -> dict:
         """
         下载YouTube音频
         Download YouTube audio
         
         Args:
             url: YouTube视频链接
+            start: 片段开始时间（秒，可选）
+            end: 片段结束时间（秒，可选）
+                 两者都提供且有FFmpeg时只下载这一段 / With both and FFmpeg,
+                 only this time range is downloaded
             
         Returns:
             dict: {
                 'video_id': 'xxx',
                 'title': '视频标题',
                 'duration': 754,
-                'audio_path': 'path/to/audio.mp3'
+                'audio_path': 'path/to/audio.wav',
+                'ext': 'wav',  # 音频格式 / Audio format
+                'section': (start, end)  # 只下载了片段时，否则为None
             }
         """
-        print(f"📥 Downloading audio from: {url}")
+        self._log(f"📥 Downloading audio from: {url}")
+        
+        # 只下载需要的时间段（yt-dlp的分段下载依赖FFmpeg）
+        # Fetch only the requested range; yt-dlp needs FFmpeg to cut sections
+        section = None
+        tag = ''
+        if start is not None and end is not None and self.has_ffmpeg:
+            section = (start, end)
+            tag = f"_{int(start * 1000)}-{int(end * 1000)}"
         
         if self.has_ffmpeg:
-            # 使用FFmpeg转码为MP3
+            # 使用FFmpeg转为16kHz单声道WAV：正是Whisper的输入格式，不做有损编码，
+            # 识别时也无需再解码重采样
+            # Convert to 16 kHz mono WAV, Whisper's native input: no lossy encode
+            # on download and no decode/resample when transcribing
             ydl_opts = {
                 'format': 'bestaudio/best',
                 'postprocessors': [{
                     'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '320',
+                    'preferredcodec': 'wav',
                 }],
-                'outtmpl': str(self.temp_dir / '%(id)s.%(ext)s'),
+                'postprocessor_args': {'ffmpegextractaudio': ['-ac', '1', '-ar', '16000']},
+                'outtmpl': str(self.temp_dir / f'%(id)s{tag}.%(ext)s'),
                 'quiet': True,
                 'no_warnings': True
             }
-            extension = 'mp3'
+            if section:
+                ydl_opts['download_ranges'] = yt_dlp.utils.download_range_func(None, [section])
+                ydl_opts['force_keyframes_at_cuts'] = True
+            extension = 'wav'
         else:
             # 没有FFmpeg，直接下载M4A格式
             print("⚠️  FFmpeg not found, downloading M4A format instead")
@@ -115,6 +210,17 @@ class YouTubeHandler:
             }
             extension = 'm4a'
         
+        # 同一视频（同一时间段）已下载过时直接复用音频和元数据，不再访问YouTube
+        # Reuse an earlier download of the same video/range without hitting YouTube
+        video_id = parse_video_id(url)
+        if video_id:
+            cached = self._load_cached(video_id, tag, extension)
+            if cached:
+                cached['section'] = section
+                self._log(f"✅ Using cached audio: {cached['title']}")
+                self._log(f"🎵 Audio: {cached['audio_path']}")
+                return cached
+        
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=True)
@@ -122,17 +228,24 @@ class YouTubeHandler:
                 video_id = info['id']
                 title = info.get('title', 'Unknown')
                 duration = info.get('duration', 0)
-                audio_path = self.temp_dir / f"{video_id}.{extension}"
+                audio_path = self.temp_dir / f"{video_id}{tag}.{extension}"
+                
+                # 保存元数据，供下次直接复用
+                meta_path = self.temp_dir / f"{video_id}.json"
+                meta_path.write_text(json.dumps({'title': title, 'duration': duration},
+                                                ensure_ascii=False), encoding='utf-8')
                 
-                print(f"✅ Downloaded: {title}")
-                print(f"⏱️  Duration: {duration}s")
-                print(f"🎵 Audio: {audio_path}")
+                self._log(f"✅ Downloaded: {title}")
+                self._log(f"⏱️  Duration: {duration}s")
+                self._log(f"🎵 Audio: {audio_path}")
                 
                 return {
                     'video_id': video_id,
                     'title': title,
                     'duration': duration,
-                    'audio_path': str(audio_path)
+                    'audio_path': str(audio_path),
+                    'ext': extension,
+                    'section': section
                 }
         except Exception as e:
             print(f"❌ Download failed: {e}")
@@ -143,7 +256,54 @@ class YouTubeHandler:
                 print("   3. Add FFmpeg bin folder to your PATH")
             raise
     
-    def extract_segment(self, audio_path: str, start: float, end: float) -> str:
+    def _load_cached(self, video_id: str, tag: str, extension: str) -> Optional[dict]:
+        """读取已下载的音频和元数据，任一缺失时返回None"""
+        audio_path = self.temp_dir / f"{video_id}{tag}.{extension}"
+        meta_path = self.temp_dir / f"{video_id}.json"
+        try:
+            if audio_path.stat().st_size == 0:
+                return None
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        
+        return {
+            'video_id': video_id,
+            'title': meta.get('title', 'Unknown'),
+            'duration': meta.get('duration', 0),
+            'audio_path': str(audio_path),
+            'ext': extension
+        }
+    
+    def _segment_path(self, audio_path: str, start: float, end: float, extension: str) -> Path:
+        """
+        按 (源文件, 开始, 结束) 计算片段文件名，相同请求得到同一文件
+        Content-addressed segment name: the same request maps to the same file
+        """
+        key = f"{Path(audio_path).stem}|{start:.3f}|{end:.3f}".encode()
+        segment_id = hashlib.blake2b(key, digest_size=6).hexdigest()
+        return self.segments_dir / f"segment_{segment_id}{extension}"
+    
+    @staticmethod
+    def _part_path(segment_path: Path) -> Path:
+        """
+        写入中的临时文件（扩展名不变，FFmpeg/pydub仍能据此判断格式）；
+        写完后再原子替换为正式文件，中断的写入不会被当成已切出的片段
+        In-progress name keeping the extension; renamed into place once complete,
+        so an interrupted cut is never mistaken for a finished clip
+        """
+        return segment_path.with_name(f"{segment_path.stem}.part{segment_path.suffix}")
+    
+    @staticmethod
+    def _is_extracted(segment_path: Path) -> bool:
+        """片段是否已切出过（存在且非空）"""
+        try:
+            return segment_path.stat().st_size > 0
+        except OSError:
+            return False
+    
+    def extract_segment(self, audio_path: str, start: float, end: float,
+                        fmt: str = None, duration: float = None) -> str:
         """
         切分音频片段
         Extract audio segment
@@ -152,26 +312,144 @@ class YouTubeHandler:
             audio_path: 完整音频路径
             start: 开始时间（秒）
             end: 结束时间（秒）
+            fmt: 音频格式（download_audio返回的ext），默认取文件扩展名
+            duration: 完整音频时长（秒），时间段覆盖全片时直接返回原文件
             
         Returns:
             str: 片段文件路径
         """
-        # 根据文件格式选择加载方法
-        if audio_path.endswith('.m4a'):
-            audio = AudioSegment.from_file(audio_path, format="m4a")
-        else:
-            audio = AudioSegment.from_mp3(audio_path)
+        # 时间段覆盖整个音频时无需切分 / The range covers the whole file: nothing to cut
+        if duration and start <= 0 and end >= duration:
+            return audio_path
         
-        segment = audio[int(start*1000):int(end*1000)]
+        if self.has_ffmpeg:
+            # FFmpeg流复制：-ss放在-i之前直接定位，只读取片段对应的数据，不解码不重新编码
+            # Stream copy with an input-side seek: only the clip's packets are read,
+            # nothing is decoded or re-encoded
+            segment_path = self._segment_path(audio_path, start, end, Path(audio_path).suffix)
+            if self._is_extracted(segment_path):
+                return str(segment_path)
+            part_path = self._part_path(segment_path)
+            cmd = ['ffmpeg', '-y', '-loglevel', 'error',
+                   '-ss', f"{start:.3f}", '-i', audio_path,
+                   '-t', f"{end - start:.3f}", '-c', 'copy', str(part_path)]
+            try:
+                _run_ffmpeg(cmd)
+                os.replace(part_path, segment_path)
+            finally:
+                part_path.unlink(missing_ok=True)
+            self._log(f"✂️  Segment saved: {segment_path}")
+            return str(segment_path)
+        
+        # 没有FFmpeg时用pydub加载、切分、导出
+        # Without FFmpeg fall back to pydub load + slice + export
+        segment_path = self._segment_path(audio_path, start, end, '.wav')
+        if self._is_extracted(segment_path):
+            return str(segment_path)
+        
+        audio = _load_full(audio_path, os.path.getmtime(audio_path),
+                           fmt or Path(audio_path).suffix.lstrip('.'))
         
-        segment_id = str(uuid.uuid4())[:8]
-        segment_path = self.segments_dir / f"segment_{segment_id}.mp3"
+        segment = audio[int(start*1000):int(end*1000)]
         
-        segment.export(str(segment_path), format="mp3")
-        print(f"✂️  Segment saved: {segment_path}")
+        # 导出为WAV：直接写出PCM数据，不需要MP3编码器（Whisper和播放都可直接读取）
+        # Export WAV: a plain PCM dump with no MP3 encode; Whisper and playback read it as-is
+        part_path = self._part_path(segment_path)
+        try:
+            segment.export(str(part_path), format="wav")
+            os.replace(part_path, segment_path)
+        finally:
+            part_path.unlink(missing_ok=True)
+        self._log(f"✂️  Segment saved: {segment_path}")
         
         return str(segment_path)
-
+    
+    # 每次FFmpeg调用最多切出的片段数：限制命令行长度（Windows上限32767字符）
+    # 和同时打开的输出文件数
+    # Max outputs per FFmpeg call, bounding the argv length (32,767 chars on
+    # Windows) and the number of files FFmpeg holds open at once
+    SEGMENT_BATCH_SIZE = 64
+    
+    def extract_segments_batch(self, audio_path: str,
+                               ranges: List[Tuple[float, float]]) -> List[Optional[str]]:
+        """
+        分批用FFmpeg切出多个片段（流复制，不重新编码）
+        Extract many segments with a few FFmpeg calls (stream copy)
+        
+        某一批失败时逐段重试，只有真正出错的片段返回None
+        A failed batch is retried segment by segment; only the failing ones yield None
+        
+        Args:
+            audio_path: 完整音频路径
+            ranges: [(开始秒, 结束秒), ...]
+            
+        Returns:
+            List[Optional[str]]: 与ranges一一对应的片段文件路径，失败的为None
+        """
+        if not self.has_ffmpeg:
+            # 没有FFmpeg时逐段用pydub切分；整段PCM在切完后立即释放，不等缓存被挤出
+            # pydub fallback; drop the cached full PCM as soon as the batch is cut
+            try:
+                return [self._extract_one(audio_path, start, end) for start, end in ranges]
+            finally:
+                _load_full.cache_clear()
+        
+        segment_paths = []
+        for i in range(0, len(ranges), self.SEGMENT_BATCH_SIZE):
+            segment_paths += self._extract_chunk(audio_path, ranges[i:i + self.SEGMENT_BATCH_SIZE])
+        
+        saved = sum(1 for path in segment_paths if path)
+        self._log(f"✂️  {saved}/{len(segment_paths)} segments saved to: {self.segments_dir}")
+        
+        return segment_paths
+    
+    def _extract_chunk(self, audio_path: str,
+                       ranges: List[Tuple[float, float]]) -> List[Optional[str]]:
+        """一次FFmpeg调用切出一批片段，失败时逐段重试"""
+        extension = Path(audio_path).suffix
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-i', audio_path]
+        segment_paths = []
+        # 正式路径 -> 写入中的临时路径 / Final path -> in-progress path
+        pending = {}
+        
+        for start, end in ranges:
+            segment_path = self._segment_path(audio_path, start, end, extension)
+            segment_paths.append(str(segment_path))
+            if segment_path in pending or self._is_extracted(segment_path):
+                continue
+            part_path = self._part_path(segment_path)
+            cmd += ['-map', '0:a', '-ss', f"{start:.3f}", '-to', f"{end:.3f}",
+                    '-c', 'copy', str(part_path)]
+            pending[segment_path] = part_path
+        
+        # 只为尚未切出的片段调用FFmpeg / Only run FFmpeg for segments not cut before
+        if pending:
+            try:
+                _run_ffmpeg(cmd)
+                for segment_path, part_path in pending.items():
+                    os.replace(part_path, segment_path)
+            except (RuntimeError, OSError) as e:
+                print(f"⚠️  Batch cut failed, retrying segments one by one: {e}")
+                failed = True
+            else:
+                failed = False
+            finally:
+                # 失败或中断时删除写了一半的临时文件 / Drop half-written outputs
+                for part_path in pending.values():
+                    part_path.unlink(missing_ok=True)
+            
+            if failed:
+                return [self._extract_one(audio_path, start, end) for start, end in ranges]
+        
+        return segment_paths
+    
+    def _extract_one(self, audio_path: str, start: float, end: float) -> Optional[str]:
+        """切出单个片段，失败时输出错误并返回None"""
+        try:
+            return self.extract_segment(audio_path, start, end)
+        except Exception as e:
+            print(f"❌ Segment {start:.2f}s - {end:.2f}s failed: {e}")
+            return None
 
 if __name__ == "__main__":
     # 测试
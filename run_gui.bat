@@ -11,7 +11,17 @@ echo.
 :: Check Python
 python --version >nul 2>&1
 if errorlevel 1 (
-    echo [ERROR] Python not found! Please install Python 3.8 or higher.
+    echo [ERROR] Python not found! Please install Python 3.9 or higher.
+    echo Download from: https://www.python.org/downloads/
+    pause
+    exit /b 1
+)
+
+:: Check Python version (faster-whisper and asyncio.to_thread need 3.9+)
+python -c "import sys; sys.exit(sys.version_info < (3, 9))" >nul 2>&1
+if errorlevel 1 (
+    echo [ERROR] Python 3.9 or higher is required.
+    python --version
     echo Download from: https://www.python.org/downloads/
     pause
     exit /b 1
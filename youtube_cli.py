@@ -5,46 +5,63 @@ YouTube Learning CLI Tool
 
 Usage:
     python youtube_cli.py --url "https://youtu.be/xxx" --start 30 --end 45
+    python youtube_cli.py --url "https://youtu.be/xxx" --ranges "30-45,60-75"
     python youtube_cli.py --url "https://youtu.be/xxx" --full
 """
 import sys
 import os
 import argparse
+import queue
 import shutil
+import threading
 from pathlib import Path
+from typing import List, Tuple, TYPE_CHECKING
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-# 检查并自动安装FFmpeg
-print("🔧 Checking FFmpeg...")
-from modules.youtube_handler import check_ffmpeg, setup_ffmpeg_path
+from modules.database import VocabDatabase
 
-if not check_ffmpeg():
-    print("⚠️  FFmpeg not found. Auto-installing...")
-    try:
-        # 尝试从install_ffmpeg.py导入安装函数
-        sys.path.insert(0, str(Path(__file__).parent))
-        from install_ffmpeg import install_ffmpeg
-        if install_ffmpeg():
-            setup_ffmpeg_path()
-            print("✅ FFmpeg installed and configured!")
-        else:
-            print("❌ FFmpeg auto-installation failed.")
+# yt-dlp、Whisper、翻译等重型模块在参数校验通过后才导入（--help和参数错误立即返回）
+# Heavy modules are imported after argparse succeeds, so --help and usage errors are instant
+if TYPE_CHECKING:
+    from modules.youtube_handler import YouTubeHandler
+
+# --quiet 时不输出横幅、步骤提示等装饰性信息（错误和结果照常输出）
+# With --quiet, banners and step notes are skipped; errors and results still print
+QUIET = False
+
+
+def log(*args):
+    """输出装饰性信息 / Print decorative output unless --quiet"""
+    if not QUIET:
+        print(*args)
+
+
+def ensure_ffmpeg():
+    """检查并自动安装FFmpeg"""
+    log("🔧 Checking FFmpeg...")
+    from modules.youtube_handler import check_ffmpeg, setup_ffmpeg_path
+    
+    if not check_ffmpeg():
+        print("⚠️  FFmpeg not found. Auto-installing...")
+        try:
+            # 尝试从install_ffmpeg.py导入安装函数
+            from install_ffmpeg import install_ffmpeg
+            if install_ffmpeg():
+                setup_ffmpeg_path()
+                log("✅ FFmpeg installed and configured!")
+            else:
+                print("❌ FFmpeg auto-installation failed.")
+                print("   Please run: python install_ffmpeg.py")
+                print("   Or download manually from: https://www.gyan.dev/ffmpeg/builds/")
+                sys.exit(1)
+        except Exception as e:
+            print(f"❌ Error installing FFmpeg: {e}")
             print("   Please run: python install_ffmpeg.py")
-            print("   Or download manually from: https://www.gyan.dev/ffmpeg/builds/")
             sys.exit(1)
-    except Exception as e:
-        print(f"❌ Error installing FFmpeg: {e}")
-        print("   Please run: python install_ffmpeg.py")
-        sys.exit(1)
-else:
-    print("✅ FFmpeg is ready!")
-    setup_ffmpeg_path()
-
-from modules.youtube_handler import YouTubeHandler
-from modules.translator import HindiTranslator
-from modules.whisper_engine import WhisperEngine
-from modules.database import VocabDatabase
+    else:
+        log("✅ FFmpeg is ready!")
+        setup_ffmpeg_path()
 
 
 def format_four_lines(data: dict) -> str:
@@ -62,51 +79,79 @@ def format_four_lines(data: dict) -> str:
     """.strip()
 
 
+def check_ranges(youtube: 'YouTubeHandler', url: str, ranges: List[Tuple[float, float]]) -> bool:
+    """下载前先获取视频时长，时间段超出视频范围时直接报错"""
+    try:
+        info = youtube.probe(url)
+    except Exception as e:
+        print(f"❌ Cannot read video info: {e}")
+        return False
+    
+    duration = info['duration']
+    for start, end in ranges:
+        if not 0 <= start < end or (duration and end > duration):
+            print(f"❌ Invalid range {start}s - {end}s (video duration: {duration}s)")
+            return False
+    return True
+
+
 def process_segment(url: str, start: float, end: float, db: VocabDatabase = None):
     """
     处理单个时间段
     Process a single time segment
     """
-    print("\n" + "="*60)
-    print("🎬 YouTube Learning Mode")
-    print("="*60)
+    from modules.youtube_handler import YouTubeHandler
+    from modules.translator import HindiTranslator
+    from modules.whisper_engine import WhisperEngine
+    
+    log("\n" + "="*60)
+    log("🎬 YouTube Learning Mode")
+    log("="*60)
     
     # 初始化组件
-    youtube = YouTubeHandler()
+    youtube = YouTubeHandler(verbose=not QUIET)
     translator = HindiTranslator()
     
-    # 1. 下载音频（如果还没有）
-    print("\n📥 Step 1: Downloading audio...")
-    try:
-        video_info = youtube.download_audio(url)
-    except Exception as e:
-        print(f"❌ Download failed: {e}")
+    # 0. 先验证时间段，避免无效请求白白下载
+    if not check_ranges(youtube, url, [(start, end)]):
         return
     
-    # 2. 切分音频
-    print(f"\n✂️  Step 2: Extracting segment ({start}s - {end}s)...")
+    # 1. 下载音频（有FFmpeg时只下载所需时间段）
+    log("\n📥 Step 1: Downloading audio...")
     try:
-        segment_path = youtube.extract_segment(
-            video_info['audio_path'], start, end
-        )
+        video_info = youtube.download_audio(url, start, end)
     except Exception as e:
-        print(f"❌ Segment extraction failed: {e}")
+        print(f"❌ Download failed: {e}")
         return
     
+    # 2. 切分音频（已按时间段下载时，下载结果就是片段）
+    log(f"\n✂️  Step 2: Extracting segment ({start}s - {end}s)...")
+    if video_info['section']:
+        segment_path = video_info['audio_path']
+    else:
+        try:
+            segment_path = youtube.extract_segment(
+                video_info['audio_path'], start, end, video_info['ext'],
+                video_info['duration']
+            )
+        except Exception as e:
+            print(f"❌ Segment extraction failed: {e}")
+            return
+    
     # 3. Whisper转录
-    print("\n🎯 Step 3: Transcribing with Whisper...")
+    log("\n🎯 Step 3: Transcribing with Whisper...")
     try:
         whisper = WhisperEngine()
-        hindi_text = whisper.transcribe(segment_path)
-        print(f"📝 Recognized: {hindi_text}")
+        sentences = [seg['text'] for seg in whisper.transcribe_segments(segment_path) if seg['text']]
+        log(f"📝 Recognized: {' '.join(sentences)}")
     except Exception as e:
         print(f"❌ Transcription failed: {e}")
         return
     
     # 4. 翻译
-    print("\n🌍 Step 4: Translating...")
+    log("\n🌍 Step 4: Translating...")
     try:
-        result = translator.translate_full(hindi_text)
+        result = translator.translate_sentences(sentences)
         print("\n" + format_four_lines(result))
     except Exception as e:
         print(f"❌ Translation failed: {e}")
@@ -114,7 +159,7 @@ def process_segment(url: str, start: float, end: float, db: VocabDatabase = None
     
     # 5. 保存到数据库（如果提供了db）
     if db:
-        print("\n💾 Step 5: Saving to database...")
+        log("\n💾 Step 5: Saving to database...")
         try:
             lesson_id = db.add_youtube_lesson(
                 video_url=url,
@@ -131,9 +176,134 @@ def process_segment(url: str, start: float, end: float, db: VocabDatabase = None
         except Exception as e:
             print(f"❌ Database save failed: {e}")
     
-    print("\n" + "="*60)
-    print("✨ Done!")
-    print("="*60 + "\n")
+    log("\n" + "="*60)
+    log("✨ Done!")
+    log("="*60 + "\n")
+
+
+def parse_ranges(text: str) -> List[Tuple[float, float]]:
+    """解析 "30-45,60-75" 形式的时间段列表"""
+    ranges = []
+    for part in text.split(','):
+        try:
+            start, end = (float(value) for value in part.split('-'))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid range: {part!r} (expected START-END)")
+        if not 0 <= start < end:
+            raise argparse.ArgumentTypeError(f"invalid range: {part!r} (START must be < END)")
+        ranges.append((start, end))
+    return ranges
+
+
+def process_segments(url: str, ranges: List[Tuple[float, float]], db: VocabDatabase = None):
+    """
+    批量处理同一视频的多个时间段：只下载一次，转录和翻译以流水线方式并行
+    Process several segments of one video: download once, then pipeline
+    transcription and translation
+    """
+    from modules.youtube_handler import YouTubeHandler
+    from modules.translator import HindiTranslator
+    from modules.whisper_engine import WhisperManager
+    
+    log("\n" + "="*60)
+    log(f"🎬 YouTube Learning Mode ({len(ranges)} segments)")
+    log("="*60)
+    
+    youtube = YouTubeHandler(verbose=not QUIET)
+    translator = HindiTranslator()
+    
+    # 0. 先验证所有时间段，避免无效请求白白下载
+    if not check_ranges(youtube, url, ranges):
+        return
+    
+    # 1. 下载完整音频（只下载一次）
+    log("\n📥 Step 1: Downloading audio...")
+    try:
+        video_info = youtube.download_audio(url)
+    except Exception as e:
+        print(f"❌ Download failed: {e}")
+        return
+    
+    # 2. 分批用FFmpeg切出所有片段（切分失败的片段为None）
+    log(f"\n✂️  Step 2: Extracting {len(ranges)} segments...")
+    try:
+        segment_paths = youtube.extract_segments_batch(video_info['audio_path'], ranges)
+    except Exception as e:
+        print(f"❌ Segment extraction failed: {e}")
+        return
+    
+    # 3. 转录和翻译组成两级流水线：Whisper逐段转录（独占全部CPU线程），
+    #    翻译线程同时处理上一段的网络请求，两者互相掩盖等待时间
+    # Two-stage pipeline: Whisper transcribes segments one at a time (it already
+    # uses every CPU thread) while the translator thread handles the previous
+    # segment's network calls
+    log("\n🎯 Step 3: Transcribing and translating...")
+    whisper = WhisperManager.get_engine()
+    
+    # 队列有上限，转录领先翻译太多时暂停 / Bounded so transcription can't run far ahead
+    trans_q = queue.Queue(maxsize=4)
+    result_q = queue.Queue()
+    
+    def transcribe_worker():
+        for index, segment_path in enumerate(segment_paths):
+            if segment_path is None:
+                result_q.put((index, RuntimeError("segment extraction failed")))
+                continue
+            try:
+                sentences = [seg['text'] for seg in whisper.transcribe_segments(segment_path)
+                             if seg['text']]
+            except Exception as e:
+                result_q.put((index, e))
+                continue
+            trans_q.put((index, sentences))
+        trans_q.put(None)
+    
+    def translate_worker():
+        while True:
+            item = trans_q.get()
+            if item is None:
+                return
+            index, sentences = item
+            try:
+                result_q.put((index, translator.translate_sentences(sentences)))
+            except Exception as e:
+                result_q.put((index, e))
+    
+    for worker in (transcribe_worker, translate_worker):
+        threading.Thread(target=worker, daemon=True).start()
+    
+    # 每段都会放入一个结果或异常，按原顺序整理
+    # Every segment yields exactly one result or exception; restore input order
+    results = [None] * len(segment_paths)
+    for _ in segment_paths:
+        index, result = result_q.get()
+        results[index] = result
+    
+    lessons = []
+    for (start, end), segment_path, result in zip(ranges, segment_paths, results):
+        print(f"\n⏱️  {start}s - {end}s")
+        if isinstance(result, Exception):
+            print(f"❌ Processing failed: {result}")
+            continue
+        print(format_four_lines(result))
+        lessons.append((
+            url, video_info['title'], segment_path, start, end,
+            result['hindi'], result['transliteration'],
+            result['english'], result['chinese']
+        ))
+    
+    # 4. 所有结果在一个事务中写入数据库（如果提供了db）
+    if db and lessons:
+        log("\n💾 Step 4: Saving to database...")
+        try:
+            count = db.add_youtube_lessons_bulk(lessons)
+            print(f"✅ Saved {count} lessons!")
+        except Exception as e:
+            print(f"❌ Database save failed: {e}")
+    
+    log("\n" + "="*60)
+    log("✨ Done!")
+    log("="*60 + "\n")
 
 
 def main():
@@ -145,6 +315,9 @@ Examples:
   # Process specific time segment
   python youtube_cli.py --url "https://youtu.be/rRyb3Cm0eT0" --start 30 --end 45
   
+  # Process several segments of one video
+  python youtube_cli.py --url "https://youtu.be/rRyb3Cm0eT0" --ranges "30-45,60-75,120-140"
+  
   # Process with database save
   python youtube_cli.py --url "https://youtu.be/rRyb3Cm0eT0" --start 60 --end 75 --save
   
@@ -159,23 +332,36 @@ Examples:
                        help='Start time in seconds')
     parser.add_argument('--end', '-e', type=float,
                        help='End time in seconds')
+    parser.add_argument('--ranges', '-r', type=parse_ranges,
+                       help='Several segments, e.g. "30-45,60-75,120-140"')
     parser.add_argument('--save', action='store_true',
                        help='Save to database')
     parser.add_argument('--full', '-f', action='store_true',
                        help='Process full video with auto-segmentation')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                       help='Only print errors and results')
     
     args = parser.parse_args()
     
-    # 验证参数
-    if not args.full and (args.start is None or args.end is None):
-        parser.error("--start and --end are required unless using --full")
+    global QUIET
+    QUIET = args.quiet
     
-    # 初始化数据库（如果需要保存）
-    db = VocabDatabase() if args.save else None
+    # 验证参数
+    if not args.full and not args.ranges and (args.start is None or args.end is None):
+        parser.error("--start and --end are required unless using --ranges or --full")
     
     if args.full:
         print("\n🚧 Full video mode not yet implemented.")
         print("Use --start and --end for specific segments.\n")
+        return
+    
+    ensure_ffmpeg()
+    
+    # 初始化数据库（如果需要保存）
+    db = VocabDatabase() if args.save else None
+    
+    if args.ranges:
+        process_segments(args.url, args.ranges, db)
     else:
         process_segment(args.url, args.start, args.end, db)
 